@@ -133,6 +133,9 @@ scheduler_events = {
     "all": [
         "supplier_feed.supplier_feed.doctype.feed_setup.feed_setup.check_feeds_to_fetch"
     ],
+    "daily_long": [
+        "supplier_feed.supplier_feed.utils.feed_retention.purge_old_records"
+    ],
 #	"daily": [
 #		"supplier_feed.tasks.daily"
 #	],
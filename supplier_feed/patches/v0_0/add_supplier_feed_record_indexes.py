@@ -0,0 +1,6 @@
+from supplier_feed.supplier_feed.doctype.supplier_feed_record.supplier_feed_record import on_doctype_update
+
+
+def execute():
+    """Add the Supplier Feed Record indexes on sites that already have the table"""
+    on_doctype_update()
\ No newline at end of file
@@ -0,0 +1,8 @@
+from supplier_feed.supplier_feed.doctype.feed_record_count.feed_record_count import on_doctype_update
+from supplier_feed.supplier_feed.utils.feed_stats import rebuild_record_counts
+
+
+def execute():
+    """Fill the Feed Record Count counters from existing Supplier Feed Records"""
+    on_doctype_update()
+    rebuild_record_counts()
\ No newline at end of file
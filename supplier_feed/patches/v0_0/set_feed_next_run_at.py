@@ -0,0 +1,17 @@
+import frappe
+from supplier_feed.supplier_feed.doctype.feed_setup.feed_setup import get_next_run_at, on_doctype_update
+
+
+def execute():
+    """Compute next_run_at for existing feeds so the scheduler picks them up"""
+    on_doctype_update()
+    for feed in frappe.get_all(
+        "Feed Setup",
+        fields=["name", "schedule_type", "cron_expression", "interval_minutes", "last_fetch"]
+    ):
+        try:
+            next_run_at = get_next_run_at(feed)
+        except Exception:
+            # Invalid cron expressions are reported when the feed is next saved
+            continue
+        frappe.db.set_value("Feed Setup", feed.name, "next_run_at", next_run_at, update_modified=False)
\ No newline at end of file
@@ -0,0 +1,55 @@
+# Benchmarks for the supplier feed pipeline, run with bench execute
+import frappe
+
+
+def make_feed_setup(feed_name, mappings, **values):
+    """
+    Insert a Feed Setup for a benchmark run, owned by the first Supplier
+
+    Args:
+        feed_name (str): Feed name
+        mappings (list): Field Mapping rows
+        **values: Other Feed Setup fields, e.g. feed_url or ingestion_mode
+
+    Returns:
+        Document: The inserted Feed Setup
+    """
+    supplier = frappe.db.get_value("Supplier", {}, "name")
+    if not supplier:
+        frappe.throw("At least one Supplier is required to run the benchmark")
+
+    feed_setup = frappe.get_doc({
+        "doctype": "Feed Setup",
+        "feed_name": feed_name,
+        "supplier": supplier,
+        "feed_url": "http://localhost/benchmark.csv",
+        "feed_format": "CSV",
+        **values,
+        "field_mappings": mappings
+    })
+    feed_setup.insert(ignore_permissions=True)
+    return feed_setup
+
+
+def get_rate(rows, seconds):
+    """Return rows per second, or None if no time was measured"""
+    return round(rows / seconds, 1) if seconds else None
+
+
+def make_result(label, rows, seconds):
+    """Return the result of one timed run"""
+    return {
+        "label": label,
+        "rows": rows,
+        "seconds": round(seconds, 3),
+        "rows_per_sec": get_rate(rows, seconds)
+    }
+
+
+def print_results(results):
+    """Print one line per result with its speed-up over the first"""
+    baseline = results[0]["rows_per_sec"]
+    for result in results:
+        speedup = f"{result['rows_per_sec'] / baseline:.1f}x" if baseline and result["rows_per_sec"] else "-"
+        print(f"{result['label']:<14} {result['rows']:>8} rows  {result['seconds']:>8}s  "
+              f"{result['rows_per_sec']:>10} rows/sec  {speedup}")
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""Synthetic supplier catalogues and a local HTTP server to fetch them from
+
+Each shape in FEED_SHAPES describes a catalogue layout together with the
+Field Mappings that read it, so the same items can be pushed through the
+real fetch, parse, map and insert code in any format:
+
+    with serve_feeds(directory) as base_url:
+        path = write_feed(directory, "xml_namespaced", 10000)
+        download_feed(f"{base_url}/{os.path.basename(path)}")
+"""
+import csv
+import gzip
+import http.server
+import json
+import os
+import threading
+from contextlib import contextmanager
+from xml.sax.saxutils import escape, quoteattr
+
+GOOGLE_NS = "http://base.google.com/ns/1.0"
+ATOM_NS = "http://www.w3.org/2005/Atom"
+
+BASIC_MAPPINGS = [
+    {"source_field": "sku", "target_field": "item_code"},
+    {"source_field": "name", "target_field": "item_name"},
+    {"source_field": "description", "target_field": "description"},
+    {"source_field": "price", "target_field": "price", "transform": "Float"},
+    {"source_field": "stock", "target_field": "stock_qty", "transform": "Integer"}
+]
+
+FEED_SHAPES = {
+    "csv": {
+        "format": "CSV",
+        "mappings": BASIC_MAPPINGS
+    },
+    "csv_semicolon": {
+        # Quoted fields holding the delimiter, quotes and line breaks
+        "format": "CSV",
+        "delimiter": ";",
+        "multiline": True,
+        "mappings": BASIC_MAPPINGS
+    },
+    "csv_gzip": {
+        "format": "CSV",
+        "compress": True,
+        "mappings": BASIC_MAPPINGS
+    },
+    "xml": {
+        "format": "XML",
+        "mappings": BASIC_MAPPINGS
+    },
+    "xml_namespaced": {
+        # Atom feed with Google Shopping fields, attributes and nested prices
+        "format": "XML",
+        "mappings": [
+            {"source_field": f"{{{GOOGLE_NS}}}id", "target_field": "item_code"},
+            {"source_field": f"{{{ATOM_NS}}}title", "target_field": "item_name", "transform": "Trim"},
+            {"source_field": f"{{{ATOM_NS}}}summary", "target_field": "description"},
+            {"source_field": f"{{{GOOGLE_NS}}}price_{{{GOOGLE_NS}}}amount", "target_field": "price", "transform": "Float"},
+            {"source_field": f"{{{GOOGLE_NS}}}availability_quantity", "target_field": "stock_qty", "transform": "Integer"}
+        ]
+    },
+    "xml_sparse": {
+        # Some products have no price or stock element
+        "format": "XML",
+        "sparse": True,
+        "mappings": BASIC_MAPPINGS
+    },
+    "json": {
+        "format": "JSON",
+        "mappings": BASIC_MAPPINGS
+    },
+    "json_sparse": {
+        # Some items have no price or stock key
+        "format": "JSON",
+        "sparse": True,
+        "mappings": BASIC_MAPPINGS
+    },
+    "json_nested": {
+        # Items below an envelope, with nested objects and arrays
+        "format": "JSON",
+        "json_items_path": "data.products",
+        "nested": True,
+        "mappings": [
+            {"source_field": "sku", "target_field": "item_code"},
+            {"source_field": "name", "target_field": "item_name", "transform": "Trim"},
+            {"source_field": "texts/0/body", "target_field": "description"},
+            {"source_field": "price/amount", "target_field": "price", "transform": "Float", "scale": 0.01},
+            {"source_field": "stock/quantity", "target_field": "stock_qty", "transform": "Integer"}
+        ]
+    }
+}
+
+
+def make_item(i, multiline=False, sparse=False):
+    """Return the fields of the i-th synthetic item"""
+    description = f'Synthetic item {i}, size "L"; colour {("red", "green", "blue")[i % 3]}'
+    if multiline and i % 10 == 0:
+        description += "\nSecond line of the description"
+    item = {
+        "sku": f"BENCH-{i:07d}",
+        "name": f"Benchmark item {i}",
+        "description": description,
+        "price": f"{10 + i % 500}.95",
+        "stock": str(i % 40)
+    }
+    if sparse:
+        if i % 7 == 0:
+            del item["price"]
+        if i % 5 == 0:
+            del item["stock"]
+    return item
+
+
+def write_feed(directory, shape, rows):
+    """
+    Write a synthetic catalogue in the given shape
+
+    Args:
+        directory (str): Directory to write the file to
+        shape (str): Key of FEED_SHAPES
+        rows (int): Number of items
+
+    Returns:
+        str: Path of the written file
+    """
+    spec = FEED_SHAPES[shape]
+    extension = {"CSV": "csv", "XML": "xml", "JSON": "json"}[spec["format"]]
+    path = os.path.join(directory, f"{shape}.{extension}")
+    if spec.get("compress"):
+        path += ".gz"
+
+    opener = gzip.open if spec.get("compress") else open
+    with opener(path, "wt", encoding="utf-8", newline="") as f:
+        if spec["format"] == "CSV":
+            _write_csv(f, spec, rows)
+        elif shape == "xml_namespaced":
+            _write_namespaced_xml(f, rows)
+        elif spec["format"] == "XML":
+            _write_xml(f, spec, rows)
+        else:
+            _write_json(f, spec, rows)
+
+    return path
+
+
+def _write_csv(f, spec, rows):
+    writer = csv.writer(f, delimiter=spec.get("delimiter", ","))
+    writer.writerow(["sku", "name", "description", "price", "stock"])
+    for i in range(rows):
+        writer.writerow(make_item(i, spec.get("multiline")).values())
+
+
+def _write_xml(f, spec, rows):
+    f.write('<?xml version="1.0" encoding="UTF-8"?>\n<catalog><header><supplier>Benchmark</supplier></header><products>\n')
+    for i in range(rows):
+        item = make_item(i, sparse=spec.get("sparse"))
+        f.write("<product>")
+        for key, value in item.items():
+            f.write(f"<{key}>{escape(value)}</{key}>")
+        f.write("</product>\n")
+    f.write("</products></catalog>\n")
+
+
+def _write_namespaced_xml(f, rows):
+    f.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<feed xmlns="{ATOM_NS}" xmlns:g="{GOOGLE_NS}">')
+    f.write('<title>Benchmark</title><link rel="self" href="http://localhost/"/><link rel="alternate" href="http://localhost/"/>\n')
+    for i in range(rows):
+        item = make_item(i)
+        f.write(
+            f"<entry><g:id>{item['sku']}</g:id><title> {escape(item['name'])} </title>"
+            f"<summary>{escape(item['description'])}</summary>"
+            f"<g:price currency=\"EUR\"><g:amount>{item['price']}</g:amount></g:price>"
+            f"<g:availability quantity={quoteattr(item['stock'])}>in stock</g:availability>"
+            f"<link href=\"http://localhost/{item['sku']}\"/></entry>\n"
+        )
+    f.write("</feed>\n")
+
+
+def _write_json(f, spec, rows):
+    nested = spec.get("nested")
+    f.write('{"meta": {"supplier": "Benchmark"}, "data": {"products": [\n' if nested else "[\n")
+    for i in range(rows):
+        item = make_item(i, sparse=spec.get("sparse"))
+        if nested:
+            item = {
+                "sku": item["sku"],
+                "name": f" {item['name']} ",
+                "texts": [{"lang": "en", "body": item["description"]}],
+                "price": {"amount": round(float(item["price"]) * 100), "currency": "EUR"},
+                "stock": {"quantity": int(item["stock"]), "warehouses": ["A", "B"]}
+            }
+        f.write(("," if i else "") + json.dumps(item) + "\n")
+    f.write("]}}\n" if nested else "]\n")
+
+
+@contextmanager
+def serve_feeds(directory):
+    """
+    Serve the files of a directory over HTTP on a free local port
+
+    Yields:
+        str: Base URL of the server
+    """
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, directory=directory, **kwargs)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
\ No newline at end of file
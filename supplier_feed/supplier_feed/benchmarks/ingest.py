@@ -0,0 +1,38 @@
+"""Compare per-document and bulk ingestion of Supplier Feed Records
+
+Run against a development site; everything is rolled back afterwards:
+
+    bench --site dev.local execute supplier_feed.supplier_feed.benchmarks.ingest.run --kwargs "{'rows': 5000}"
+"""
+import frappe
+import time
+from supplier_feed.supplier_feed.benchmarks import make_feed_setup, make_result, print_results
+from supplier_feed.supplier_feed.benchmarks.feed_generator import BASIC_MAPPINGS, make_item
+
+BENCHMARK_FEED = "_Benchmark Feed"
+
+
+def measure(ingestion_mode, items, batch_size=1000):
+    """Ingest items with the given mode and return rows per second"""
+    feed_setup = make_feed_setup(BENCHMARK_FEED, BASIC_MAPPINGS, ingestion_mode=ingestion_mode, batch_size=batch_size)
+    try:
+        start = time.perf_counter()
+        feed_setup.process_feed_data(items)
+        elapsed = time.perf_counter() - start
+    finally:
+        frappe.db.rollback()
+
+    return make_result(ingestion_mode, len(items), elapsed)
+
+
+def run(rows=5000, batch_size=1000):
+    """Print rows/sec for both ingestion modes"""
+    frappe.flags.mute_messages = True
+    items = [make_item(i) for i in range(int(rows))]
+
+    results = [
+        measure("Per Document", items),
+        measure("Bulk Insert", items, int(batch_size))
+    ]
+    print_results(results)
+    return results
\ No newline at end of file
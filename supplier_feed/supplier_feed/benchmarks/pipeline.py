@@ -0,0 +1,237 @@
+"""Throughput, peak memory and stage latencies of the feed pipeline
+
+Generates a synthetic catalogue for each shape in FEED_SHAPES, serves it
+from a local HTTP server and pushes it through the same code a fetch uses:
+download_feed, FeedParser.detect_format, FeedParser.parse_stream and
+FeedSetup.process_feed_data. Each case runs in a fresh process so its peak
+RSS is its own, and is rolled back afterwards.
+
+Results are written as JSON and can be compared between commits:
+
+    bench --site dev.local execute supplier_feed.supplier_feed.benchmarks.pipeline.run --kwargs "{'rows': 20000, 'output': '/tmp/before.json'}"
+    bench --site dev.local execute supplier_feed.supplier_feed.benchmarks.pipeline.compare --kwargs "{'baseline': '/tmp/before.json', 'current': '/tmp/after.json'}"
+"""
+import frappe
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from frappe.utils import now
+from supplier_feed.supplier_feed.benchmarks import get_rate, make_feed_setup
+from supplier_feed.supplier_feed.benchmarks.feed_generator import FEED_SHAPES, serve_feeds, write_feed
+from supplier_feed.supplier_feed.utils.feed_fetcher import download_feed
+from supplier_feed.supplier_feed.utils.feed_parser import FeedParser, FORMAT_DETECT_SIZE
+from supplier_feed.supplier_feed.utils.feed_profiler import FetchProfile, get_peak_memory_mb
+
+BENCHMARK_FEED = "_Benchmark Pipeline"
+STAGES = ("download", "decode", "detect", "parse", "map", "insert")
+
+# Metrics compared between runs, and whether a higher value is better
+COMPARED_METRICS = {
+    "rows_per_sec": True,
+    "detect_time": False,
+    "parse_time": False,
+    "map_time": False,
+    "insert_time": False,
+    "peak_rss_mb": False
+}
+
+
+def run(rows=20000, shapes=None, ingestion_mode="Bulk Insert", output=None, isolate=True):
+    """
+    Benchmark every feed shape and print a summary
+
+    Args:
+        rows (int, optional): Items per feed. Defaults to 20000.
+        shapes (list or str, optional): FEED_SHAPES keys, comma separated
+                                        or a list. Defaults to all shapes.
+        ingestion_mode (str, optional): Feed Setup ingestion mode. Defaults
+                                        to "Bulk Insert".
+        output (str, optional): Path to write the JSON results to
+        isolate (bool, optional): Run each case in a fresh process so peak
+                                  RSS is per case. Defaults to True.
+
+    Returns:
+        dict: Results with one entry per shape in "cases"
+    """
+    rows = int(rows)
+    if isinstance(shapes, str):
+        shapes = [shape.strip() for shape in shapes.split(",") if shape.strip()]
+    shapes = shapes or list(FEED_SHAPES)
+    frappe.flags.mute_messages = True
+
+    results = {
+        "commit": get_commit(),
+        "timestamp": now(),
+        "python": platform.python_version(),
+        "rows": rows,
+        "ingestion_mode": ingestion_mode,
+        "cases": []
+    }
+
+    with tempfile.TemporaryDirectory() as directory, serve_feeds(directory) as base_url:
+        for shape in shapes:
+            path = write_feed(directory, shape, rows)
+            url = f"{base_url}/{os.path.basename(path)}"
+            if isolate:
+                case = run_isolated(shape, url, rows, ingestion_mode)
+            else:
+                try:
+                    case = measure_case(shape, url, rows, ingestion_mode)
+                finally:
+                    frappe.db.rollback()
+            case["file_size"] = os.path.getsize(path)
+            results["cases"].append(case)
+            print_case(case)
+
+    if output:
+        with open(output, "w") as f:
+            json.dump(results, f, indent=1)
+        print(f"Results written to {output}")
+
+    return results
+
+
+def measure_case(shape, url, rows, ingestion_mode):
+    """Fetch, detect, parse, map and insert one synthetic feed"""
+    spec = FEED_SHAPES[shape]
+    feed_setup = make_feed_setup(
+        f"{BENCHMARK_FEED} {shape}", spec["mappings"],
+        feed_url=url,
+        feed_format=spec["format"],
+        json_items_path=spec.get("json_items_path"),
+        ingestion_mode=ingestion_mode
+    )
+    profile = FetchProfile()
+    start = time.perf_counter()
+
+    with download_feed(url) as download:
+        profile.add("download", download.timings.get("download", 0))
+        profile.add("decode", download.timings.get("decode", 0))
+
+        with profile.measure("detect"):
+            detected = FeedParser.detect_format(download.open_binary().read(FORMAT_DETECT_SIZE))
+
+        # The configured format is used either way, so a misdetection is reported, not fatal
+        data = FeedParser.parse_stream(download, spec["format"], json_path=spec.get("json_items_path"))
+        result = feed_setup.process_feed_data(data, profile)
+        size = download.size
+
+    total = time.perf_counter() - start
+    if result["items"] != rows:
+        raise AssertionError(f"{shape} yielded {result['items']} items, expected {rows}")
+
+    case = {"shape": shape, "format": spec["format"], "detected_format": detected, "rows": rows, "bytes": size}
+    case.update({f"{stage}_time": round(profile.timings.get(stage, 0), 4) for stage in STAGES})
+    case["records"] = result["records"]
+    case["total_time"] = round(total, 4)
+    case["rows_per_sec"] = get_rate(rows, total)
+    case["peak_rss_mb"] = round(get_peak_memory_mb(), 1)
+    return case
+
+
+def run_isolated(shape, url, rows, ingestion_mode):
+    """Run measure_case in a fresh process connected to the same site"""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        future = executor.submit(
+            _measure_in_site, frappe.local.site, frappe.local.sites_path, shape, url, rows, ingestion_mode
+        )
+        return future.result()
+
+
+def _measure_in_site(site, sites_path, shape, url, rows, ingestion_mode):
+    frappe.init(site=site, sites_path=sites_path)
+    frappe.connect()
+    try:
+        frappe.set_user("Administrator")
+        frappe.flags.mute_messages = True
+        baseline = get_peak_memory_mb()
+        case = measure_case(shape, url, rows, ingestion_mode)
+        case["baseline_rss_mb"] = round(baseline, 1)
+        return case
+    finally:
+        frappe.db.rollback()
+        frappe.destroy()
+
+
+def print_case(case):
+    stages = "  ".join(f"{stage} {case[f'{stage}_time']:.3f}s" for stage in STAGES)
+    print(
+        f"{case['shape']:<16} {case['rows']:>8} rows  {case['rows_per_sec']:>10} rows/sec  "
+        f"{case['peak_rss_mb']:>7} MB peak  {stages}"
+    )
+    if case["detected_format"] != case["format"]:
+        print(f"  detected as {case['detected_format']}")
+
+
+def compare(baseline, current, threshold=0.1):
+    """
+    Compare two result files and print the change of every metric
+
+    Args:
+        baseline (str): Path of the earlier results
+        current (str): Path of the new results
+        threshold (float, optional): Relative change reported as a
+                                     regression. Defaults to 0.1 (10%).
+
+    Returns:
+        list: (shape, metric, baseline value, current value) of regressions
+    """
+    with open(baseline) as f:
+        before = json.load(f)
+    with open(current) as f:
+        after = json.load(f)
+
+    print(f"{before.get('commit') or 'baseline'} -> {after.get('commit') or 'current'}")
+    earlier = {case["shape"]: case for case in before["cases"]}
+    regressions = []
+
+    for case in after["cases"]:
+        previous = earlier.get(case["shape"])
+        if not previous:
+            print(f"{case['shape']}: not in baseline")
+            continue
+
+        changes = []
+        for metric, higher_is_better in COMPARED_METRICS.items():
+            old, new = previous.get(metric), case.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            changes.append(f"{metric} {old} -> {new} ({change:+.1%})")
+            if (-change if higher_is_better else change) > float(threshold):
+                regressions.append((case["shape"], metric, old, new))
+
+        if case.get("detected_format") != previous.get("detected_format"):
+            changes.append(f"detected_format {previous.get('detected_format')} -> {case.get('detected_format')}")
+
+        print(f"{case['shape']}:")
+        for change in changes:
+            print(f"  {change}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regressions above {float(threshold):.0%}:")
+        for shape, metric, old, new in regressions:
+            print(f"  {shape} {metric}: {old} -> {new}")
+    else:
+        print("\nNo regressions")
+
+    return regressions
+
+
+def get_commit():
+    """Return the current commit of the app, if it is a git checkout"""
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=frappe.get_app_path("supplier_feed"),
+            stderr=subprocess.DEVNULL,
+            text=True
+        ).strip()
+    except Exception:
+        return None
\ No newline at end of file
@@ -0,0 +1,143 @@
+"""Query plans and latencies of the Supplier Feed Record dashboard and list queries
+
+Seeds a large table of synthetic records, then runs each query with and
+without the Supplier Feed Record indexes and prints EXPLAIN and timings.
+The seeded rows are deleted afterwards:
+
+    bench --site dev.local execute supplier_feed.supplier_feed.benchmarks.record_queries.run --kwargs "{'rows': 1000000}"
+"""
+import frappe
+import statistics
+import time
+from frappe.utils import add_to_date, now_datetime
+from supplier_feed.supplier_feed.doctype.supplier_feed_record.supplier_feed_record import (
+    RECORD_INDEXES, on_doctype_update
+)
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+BENCHMARK_FEED_PREFIX = "_Benchmark Feed"
+FEEDS = 10
+STATUSES = ("Pending", "Approved", "Rejected", "Synced")
+SEED_CHUNK_SIZE = 10000
+DELETE_CHUNK_SIZE = 50000
+
+QUERIES = {
+    "status counts, one feed": (
+        """select status, count(*) from `tabSupplier Feed Record` {hint}
+        where feed_setup = %(feed_setup)s group by status"""
+    ),
+    "status counts, all feeds": (
+        """select status, count(*) from `tabSupplier Feed Record` {hint}
+        group by status"""
+    ),
+    "recent records, one feed": (
+        """select name, status, item_code, creation_date from `tabSupplier Feed Record` {hint}
+        where feed_setup = %(feed_setup)s order by creation_date desc limit 20"""
+    ),
+    "recent records, all feeds": (
+        """select name, status, item_code, creation_date from `tabSupplier Feed Record` {hint}
+        order by creation_date desc limit 20"""
+    ),
+    "pending records of a feed": (
+        """select name from `tabSupplier Feed Record` {hint}
+        where feed_setup = %(feed_setup)s and status = 'Pending'
+        order by creation_date desc limit 20"""
+    ),
+    "records by item code": (
+        """select name, feed_setup from `tabSupplier Feed Record` {hint}
+        where item_code = %(item_code)s and feed_setup = %(feed_setup)s"""
+    )
+}
+
+
+def seed(rows):
+    """Insert synthetic records spread over several feeds, statuses and dates"""
+    user = frappe.session.user
+    start = add_to_date(now_datetime(), days=-365)
+    fields = [
+        "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+        "feed_setup", "status", "creation_date", "modified_date", "item_code", "item_name"
+    ]
+
+    for offset in range(0, rows, SEED_CHUNK_SIZE):
+        values = []
+        for i in range(offset, min(offset + SEED_CHUNK_SIZE, rows)):
+            timestamp = add_to_date(start, seconds=i * 30)
+            values.append([
+                f"bench-{i:08d}", timestamp, timestamp, user, user, 0, 0,
+                f"{BENCHMARK_FEED_PREFIX} {i % FEEDS}", STATUSES[i % 7 % len(STATUSES)],
+                timestamp, timestamp, f"BENCH-{i // FEEDS:07d}", f"Benchmark item {i}"
+            ])
+        frappe.db.bulk_insert(RECORD_DOCTYPE, fields, values)
+        frappe.db.commit()
+
+
+def cleanup():
+    """Delete the seeded records in chunks"""
+    while True:
+        frappe.db.sql(
+            f"""delete from `tab{RECORD_DOCTYPE}`
+            where feed_setup like %s limit {DELETE_CHUNK_SIZE}""",
+            f"{BENCHMARK_FEED_PREFIX}%"
+        )
+        frappe.db.commit()
+        if not frappe.db.sql(
+            f"select name from `tab{RECORD_DOCTYPE}` where feed_setup like %s limit 1",
+            f"{BENCHMARK_FEED_PREFIX}%"
+        ):
+            break
+
+
+def measure(query, values, hint="", repeat=5):
+    """Return the EXPLAIN rows and median latency in milliseconds of a query"""
+    sql = query.format(hint=hint)
+    plan = frappe.db.sql(f"explain {sql}", values, as_dict=True)
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        frappe.db.sql(sql, values)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {"plan": plan, "ms": round(statistics.median(timings), 2)}
+
+
+def print_plan(plan):
+    for row in plan:
+        print(
+            f"    type={row.get('type')} key={row.get('key')} rows={row.get('rows')} "
+            f"extra={row.get('Extra')}"
+        )
+
+
+def run(rows=1000000, keep=False):
+    """Seed the table, print plans and latencies with and without indexes, then clean up"""
+    rows = int(rows)
+    on_doctype_update()
+
+    print(f"Seeding {rows} records...")
+    start = time.perf_counter()
+    seed(rows)
+    print(f"Seeded in {time.perf_counter() - start:.1f}s")
+
+    values = {"feed_setup": f"{BENCHMARK_FEED_PREFIX} 3", "item_code": f"BENCH-{rows // FEEDS // 2:07d}"}
+    no_index = f"ignore index ({', '.join(f'`{name}`' for name in RECORD_INDEXES)})"
+
+    results = {}
+    try:
+        frappe.db.sql(f"analyze table `tab{RECORD_DOCTYPE}`")
+        for label, query in QUERIES.items():
+            without = measure(query, values, hint=no_index)
+            indexed = measure(query, values)
+            results[label] = {"without_indexes": without["ms"], "indexed": indexed["ms"]}
+
+            print(f"\n{label}: {without['ms']} ms without indexes, {indexed['ms']} ms indexed")
+            print("  without indexes:")
+            print_plan(without["plan"])
+            print("  indexed:")
+            print_plan(indexed["plan"])
+    finally:
+        if not keep:
+            cleanup()
+
+    return results
\ No newline at end of file
@@ -0,0 +1,8 @@
+import frappe
+from frappe.model.document import Document
+
+class FeedItemIndex(Document):
+    pass
+
+def on_doctype_update():
+    frappe.db.add_unique("Feed Item Index", ["feed_setup", "item_code"], constraint_name="unique_feed_item")
\ No newline at end of file
@@ -0,0 +1,5 @@
+import frappe
+from frappe.model.document import Document
+
+class FeedPayload(Document):
+    pass
\ No newline at end of file
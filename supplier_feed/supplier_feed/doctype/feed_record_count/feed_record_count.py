@@ -0,0 +1,8 @@
+import frappe
+from frappe.model.document import Document
+
+class FeedRecordCount(Document):
+    pass
+
+def on_doctype_update():
+    frappe.db.add_unique("Feed Record Count", ["feed_setup", "status"], constraint_name="unique_feed_status")
\ No newline at end of file
@@ -0,0 +1,73 @@
+import frappe
+import time
+from frappe.model.document import Document
+from frappe.utils import now_datetime, flt, get_datetime, cint
+
+class FeedRun(Document):
+    def set_source(self, digest):
+        """Record the digest of the payload being ingested
+        
+        If the previous run of the feed stopped part way through the same
+        payload, this run resumes after the rows it committed. Returns the
+        number of rows to skip.
+        """
+        self.source_digest = digest
+        
+        previous = frappe.get_all(
+            "Feed Run",
+            filters={"feed_setup": self.feed_setup, "name": ["!=", self.name], "status": ["!=", "Not Modified"]},
+            fields=["name", "status", "source_digest", "rows_committed"],
+            order_by="started_at desc",
+            limit=1
+        )
+        if previous:
+            previous = previous[0]
+            if (previous.source_digest == digest and previous.status in ("Running", "Failed")
+                    and cint(previous.rows_committed) > 0):
+                self.resumed_from = previous.name
+                self.rows_committed = previous.rows_committed
+                if previous.status == "Running":
+                    # Its worker died or timed out without recording a result
+                    frappe.db.set_value("Feed Run", previous.name, "status", "Interrupted")
+        
+        self.db_update()
+        frappe.db.commit()
+        return cint(self.rows_committed)
+    
+    def checkpoint(self, rows):
+        """Commit everything ingested so far together with the row count"""
+        self.db_set("rows_committed", rows, update_modified=False)
+        frappe.db.commit()
+    
+    def finish(self, status, **values):
+        """Close the run with its final status and throughput figures"""
+        self.update(values)
+        self.status = status
+        self.finished_at = now_datetime()
+        
+        timer = getattr(self, "_timer", None)
+        if timer is not None:
+            self.duration = time.perf_counter() - timer
+        else:
+            self.duration = (self.finished_at - get_datetime(self.started_at)).total_seconds()
+        self.rows_per_sec = flt(self.items_processed) / self.duration if self.duration else 0
+        
+        self.save(ignore_permissions=True)
+
+def start_feed_run(feed_setup):
+    """Create the Feed Run that records one fetch of a feed"""
+    run = frappe.get_doc({
+        "doctype": "Feed Run",
+        "feed_setup": feed_setup.name,
+        "status": "Running",
+        "started_at": now_datetime()
+    })
+    run.insert(ignore_permissions=True)
+    # The run must survive a rollback of the data it records
+    frappe.db.commit()
+    run._timer = time.perf_counter()
+    return run
+
+def on_doctype_update():
+    frappe.db.add_index("Feed Run", ["feed_setup", "started_at"], index_name="feed_setup_started_at")
+    frappe.db.add_index("Feed Run", ["started_at"], index_name="started_at")
\ No newline at end of file
@@ -16,6 +16,24 @@ frappe.ui.form.on('Feed Setup', {
             });
         });
         
+        // Add button to link pending records to Items
+        frm.add_custom_button(__('Match Items'), function() {
+            frappe.call({
+                method: "match_items",
+                doc: frm.doc
+            });
+        });
+        
+        // Add button to sync all approved records of this feed in the background
+        frm.add_custom_button(__('Sync Approved Records'), function() {
+            frappe.call({
+                method: "supplier_feed.supplier_feed.utils.item_sync.enqueue_bulk_sync",
+                args: {
+                    feed_setup: frm.doc.name
+                }
+            });
+        });
+        
         // Add button to view feed records
         frm.add_custom_button(__('View Feed Records'), function() {
             frappe.set_route('List', 'Supplier Feed Record', {feed_setup: frm.doc.name});
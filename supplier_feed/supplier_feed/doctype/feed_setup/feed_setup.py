@@ -1,12 +1,26 @@
 import frappe
 from frappe.model.document import Document
-import json
-import requests
-from datetime import datetime
+from datetime import datetime, timedelta
 import croniter
+import hashlib
 import time
-from frappe.utils import now_datetime, get_datetime
-from supplier_feed.supplier_feed.utils.feed_parser import FeedParser
+from urllib.parse import urlparse
+from frappe.utils import now_datetime, get_datetime, cint
+from supplier_feed.supplier_feed.utils.feed_parser import FeedParser, FORMAT_DETECT_SIZE
+from supplier_feed.supplier_feed.utils.feed_fetcher import download_feed
+from supplier_feed.supplier_feed.utils.feed_pagination import PagedFeed
+from supplier_feed.supplier_feed.utils.feed_ingest import get_record_writer, DEFAULT_BATCH_SIZE
+from supplier_feed.supplier_feed.utils.feed_delta import FeedDelta
+from supplier_feed.supplier_feed.utils.field_mapper import MappingPlan
+from supplier_feed.supplier_feed.utils.parallel_csv import parse_csv_parallel, PARALLEL_CSV_MIN_SIZE
+from supplier_feed.supplier_feed.utils.item_matcher import match_feed_records, get_match_key_order
+from supplier_feed.supplier_feed.utils.feed_locks import feed_lock, host_slot, FETCH_LOCK_TIMEOUT
+from supplier_feed.supplier_feed.utils.feed_profiler import FetchProfile
+from supplier_feed.supplier_feed.doctype.feed_run.feed_run import start_feed_run
+
+# A failed fetch is retried after this long, resuming where it stopped
+FAILED_FETCH_RETRY_MINUTES = 5
+DEFAULT_MAX_SCHEDULE_JITTER = 300
 
 class FeedSetup(Document):
     def validate(self):
@@ -15,115 +29,410 @@ class FeedSetup(Document):
                 croniter.croniter(self.cron_expression, datetime.now())
             except Exception as e:
                 frappe.throw(f"Invalid cron expression: {str(e)}")
-    
+
+        # Reject mappings that could never be applied
+        MappingPlan.from_feed_setup(self).validate()
+        
+        if self.auto_match_items:
+            get_match_key_order(self.item_match_order)
+        
+        if self.pagination_type and self.feed_format != "JSON":
+            frappe.throw("Pagination is only supported for JSON feeds")
+        
+        if cint(self.keep_synced_days) < 0 or cint(self.keep_rejected_days) < 0:
+            frappe.throw("Retention periods cannot be negative")
+
+        # Namespaced paths are long and may be wrapped when pasted
+        if self.xml_item_path:
+            self.xml_item_path = "".join(self.xml_item_path.split())
+        if self.has_value_changed("xml_item_path"):
+            # Typed in or cleared by the user
+            self.xml_item_path_detected = 0
+
+        # A different source invalidates what we know about the last fetch
+        if not self.is_new() and (self.has_value_changed("feed_url") or self.has_value_changed("feed_format")):
+            self.etag = None
+            self.last_modified_header = None
+            self.content_digest = None
+            self.detected_format = None
+            self.xml_item_fields = None
+            # Only a path found by discovery belongs to the old source
+            if self.xml_item_path_detected:
+                self.xml_item_path = None
+                self.xml_item_path_detected = 0
+        
+        self.next_run_at = get_next_run_at(self)
+
     @frappe.whitelist()
     def fetch_feed_manually(self):
-        """Manually fetch the feed data"""
-        return self.fetch_feed()
+        """Manually fetch the feed data, even if it has not changed"""
+        with feed_lock(self.name) as acquired:
+            if not acquired:
+                frappe.throw(f"Feed {self.feed_name} is already being fetched")
+            return self.fetch_feed(force=True)
     
-    def fetch_feed(self):
-        """Fetch feed data from the configured URL"""
+    def fetch_feed(self, force=False):
+        """Fetch feed data from the configured URL
+        
+        Unless force is set, the request is conditional on the ETag and
+        Last-Modified of the previous fetch, and parsing is skipped when the
+        server answers 304 or the body digest matches the previous one.
+        Every call is recorded as a Feed Run, with the time spent in each
+        stage and, if enabled on the feed, a cProfile report.
+        
+        XML feeds without an item path have it discovered from their
+        repeating elements; the path and the fields of the first items are
+        stored so the next fetch skips discovery.
+        
+        Paginated JSON APIs are fetched page by page instead, see
+        fetch_pages.
+        
+        Records are committed in chunks. If a fetch dies part way, the next
+        fetch of the same payload resumes after the last committed chunk, and
+        last_fetch is only updated once a fetch has completed.
+        """
+        run = start_feed_run(self)
+        profile = FetchProfile(enable_profiler=self.profile_fetches)
+        profile.start()
         try:
-            response = requests.get(self.feed_url, timeout=30)
-            response.raise_for_status()
-            
-            # Update last fetch time
-            self.last_fetch = now_datetime()
-            self.save()
+            if self.pagination_type:
+                return self.fetch_pages(run, profile)
             
-            # Parse the feed using our utility parser
-            data = FeedParser.parse(response.text, self.feed_format)
-            
-            # Process the parsed data
-            self.process_feed_data(data)
+            profile.stage = "download"
+            with download_feed(
+                self.feed_url,
+                timeout=30,
+                etag=None if force else self.etag,
+                last_modified=None if force else self.last_modified_header
+            ) as download:
+                profile.add("download", download.timings.get("download", 0))
+                profile.add("decode", download.timings.get("decode", 0))
+                
+                if not force and (download.not_modified or download.digest == self.content_digest):
+                    self.set_fetched()
+                    run.finish("Not Modified", bytes_fetched=download.bytes_received, **profile.stop())
+                    frappe.msgprint("Feed has not changed since the last fetch")
+                    return True
+                
+                resume_at = run.set_source(download.digest)
+                
+                # Parse the feed straight from the downloaded file
+                with profile.measure("parse"):
+                    feed_format = self.get_feed_format(download)
+                    pairs = self.parse_csv_parallel(download) if feed_format == "CSV" else None
+                    schema = {}
+                    data = pairs or FeedParser.parse_stream(
+                        download,
+                        feed_format,
+                        json_path=self.json_items_path,
+                        xml_path=self.xml_item_path,
+                        schema=schema
+                    )
+                
+                # Process the parsed data
+                result = self.process_feed_data(data, profile, run=run, resume_at=resume_at, premapped=bool(pairs))
+                
+                # Only remember the version once it has been processed
+                values = {
+                    "etag": download.headers.get("ETag"),
+                    "last_modified_header": download.headers.get("Last-Modified"),
+                    "content_digest": download.digest
+                }
+                if schema.get("item_path"):
+                    values["xml_item_fields"] = "\n".join(schema["fields"])
+                    if not self.xml_item_path:
+                        # Later fetches go straight to the learned item path
+                        values["xml_item_path"] = schema["item_path"]
+                        values["xml_item_path_detected"] = 1
+                self.set_fetched(values)
+                
+                run.finish(
+                    "Success",
+                    bytes_fetched=download.bytes_received,
+                    bytes_decompressed=download.size,
+                    items_processed=result["items"],
+                    records_created=result["records"],
+                    rows_committed=result["items"],
+                    **profile.stop()
+                )
             
             return True
         except Exception as e:
+            traceback = frappe.get_traceback()
+            # Drop the chunk in progress, earlier chunks stay committed for a resume
+            frappe.db.rollback()
+            self.db_set("next_run_at", now_datetime() + timedelta(minutes=FAILED_FETCH_RETRY_MINUTES))
+            if self.detected_format:
+                # The supplier may have switched formats, detect again next time
+                self.db_set("detected_format", None)
             error_msg = f"Error fetching feed {self.feed_name}: {str(e)}"
             frappe.log_error(error_msg, "Feed Fetch Error")
+            run.finish(
+                "Failed",
+                error=str(e),
+                error_type=type(e).__name__,
+                failed_stage=profile.stage,
+                traceback=traceback,
+                **profile.stop()
+            )
             return False
     
-    def process_feed_data(self, data):
-        """Process the parsed feed data and create Supplier Feed Records"""
-        if not data:
-            frappe.msgprint("No data found in the feed")
-            return
+    def fetch_pages(self, run, profile):
+        """Fetch a paginated JSON API, ingesting items as the pages arrive
+        
+        Pages are not conditional and their digest is only known at the end,
+        so every fetch is processed in full and does not resume.
+        """
+        pages = PagedFeed(self, profile)
+        result = self.process_feed_data(pages, profile, run=run)
+        
+        # Waiting for pages happened while items were read
+        profile.add("download", pages.wait_time)
+        profile.add("parse", -pages.wait_time)
+        
+        self.set_fetched()
+        run.finish(
+            "Success",
+            source_digest=pages.digest,
+            bytes_fetched=pages.bytes_received,
+            bytes_decompressed=pages.size,
+            items_processed=result["items"],
+            records_created=result["records"],
+            rows_committed=result["items"],
+            **profile.stop()
+        )
+        return True
+    
+    def set_fetched(self, values=None):
+        """Store the time of a completed fetch and when the feed is next due"""
+        self.last_fetch = now_datetime()
+        values = dict(values or {})
+        values["last_fetch"] = self.last_fetch
+        values["next_run_at"] = get_next_run_at(self)
+        self.db_set(values)
+    
+    @frappe.whitelist()
+    def match_items(self):
+        """Link pending records of this feed to Items"""
+        stats = match_feed_records(self)
+        frappe.msgprint(
+            f"Matched {stats['matched']} of {stats['records']} records to Items "
+            f"({', '.join(f'{key}: {stats[key]}' for key in get_match_key_order(self.item_match_order))})"
+        )
+        return stats
+    
+    def get_feed_format(self, download):
+        """Return the feed format, detecting and caching it for Auto Detect feeds"""
+        if self.feed_format != "Auto Detect":
+            return self.feed_format
+        
+        if not self.detected_format:
+            detected_format = FeedParser.detect_format(download.open_binary().read(FORMAT_DETECT_SIZE))
+            if detected_format == "UNKNOWN":
+                frappe.throw(f"Could not detect the format of feed {self.feed_name}")
+            self.db_set("detected_format", detected_format)
+        
+        return self.detected_format
+    
+    def parse_csv_parallel(self, download):
+        """Parse and map a large CSV feed in csv_parse_workers processes
         
+        Returns an iterator of (item, mapped_data) pairs in feed order, or
+        None if the feed should be parsed in this process.
+        """
+        workers = cint(self.csv_parse_workers)
+        if workers < 2 or download.size < PARALLEL_CSV_MIN_SIZE:
+            return None
+        return parse_csv_parallel(download.get_path(), self.get_mapping_plan(), workers, encoding=download.encoding)
+    
+    def process_feed_data(self, data, profile=None, run=None, resume_at=0, premapped=False):
+        """Process the parsed feed data and create Supplier Feed Records
+        
+        Accepts a list or any iterable of item dicts, so streaming parsers
+        can feed records in as they are read. Returns the number of items
+        read and records created. Time spent reading items, mapping them
+        and writing records is added to the profile's parse, map and insert
+        stages. With premapped set, data yields (item, mapped_data) pairs
+        that were already mapped by the parallel CSV parser.
+        
+        With a Feed Run, records are committed every batch_size items along
+        with the run's row count. The first resume_at items were committed
+        by an earlier attempt: they are still mapped, so change detection
+        sees them, but not written again.
+        """
+        profile = profile or FetchProfile()
+        checkpoint_size = cint(self.batch_size) or DEFAULT_BATCH_SIZE
+        clock = time.perf_counter
+        parse_time = map_time = insert_time = 0.0
+        
+        self._mapping_plan = MappingPlan.from_feed_setup(self)
+        writer = get_record_writer(self)
+        delta = FeedDelta(self) if self.delta_detection else None
+        count = 0
+        mark = clock()
+        profile.stage = "parse"
         for item in data:
+            parsed = clock()
+            count += 1
+            profile.stage = "map"
             # Map fields according to the field mappings
-            mapped_data = self.map_fields(item)
+            if premapped:
+                item, mapped_data = item
+            else:
+                mapped_data = self.map_fields(item)
             
-            # Create a new Supplier Feed Record
-            feed_record = frappe.new_doc("Supplier Feed Record")
-            feed_record.feed_setup = self.name
-            feed_record.supplier = self.supplier
-            feed_record.raw_data = json.dumps(item, indent=2)
+            # Skip items that are identical to the previous fetch
+            changed = not delta or delta.classify(item, mapped_data) != "unchanged"
+            mapped = clock()
             
-            # Set mapped fields
-            for field, value in mapped_data.items():
-                if hasattr(feed_record, field):
-                    setattr(feed_record, field, value)
+            if changed and count > resume_at:
+                profile.stage = "insert"
+                writer.add(item, mapped_data)
             
-            feed_record.insert(ignore_permissions=True)
+            if run and count > resume_at and count % checkpoint_size == 0:
+                profile.stage = "insert"
+                writer.flush()
+                run.checkpoint(count)
+            
+            profile.stage = "parse"
+            parse_time += parsed - mark
+            map_time += mapped - parsed
+            mark = clock()
+            insert_time += mark - mapped
+        
+        profile.add("parse", parse_time + clock() - mark)
+        profile.add("map", map_time)
+        profile.add("insert", insert_time)
+        
+        with profile.measure("insert"):
+            writer.flush()
+        
+        if self.auto_match_items:
+            with profile.measure("match"):
+                match_feed_records(self)
         
-        frappe.msgprint(f"Processed {len(data)} items from the feed")
+        if delta:
+            with profile.measure("insert"):
+                counts = delta.save()
+            self.db_set({
+                "last_new_items": counts["new"],
+                "last_changed_items": counts["changed"],
+                "last_unchanged_items": counts["unchanged"],
+                "last_removed_items": counts["removed"]
+            })
+        
+        result = {"items": count, "records": writer.count}
+        if not count:
+            frappe.msgprint("No data found in the feed")
+            return result
+        
+        if delta:
+            frappe.msgprint(
+                f"Processed {count} items from the feed: {counts['new']} new, {counts['changed']} changed, "
+                f"{counts['unchanged']} unchanged, {counts['removed']} removed"
+            )
+        else:
+            frappe.msgprint(f"Processed {count} items from the feed")
+        return result
     
     def map_fields(self, item):
         """Map fields from feed data to internal fields based on field mappings"""
-        mapped_data = {}
-        
-        for mapping in self.field_mappings:
-            source_field = mapping.source_field
-            target_field = mapping.target_field
-            
-            if source_field in item:
-                mapped_data[target_field] = item[source_field]
-        
-        return mapped_data
+        return self.get_mapping_plan().map(item)
+    
+    def get_mapping_plan(self):
+        """Return the field mappings compiled for the current fetch"""
+        if not getattr(self, "_mapping_plan", None):
+            self._mapping_plan = MappingPlan.from_feed_setup(self)
+        return self._mapping_plan
+
+def get_next_run_at(feed, now=None):
+    """
+    Return when a feed is next due, or None if it has no schedule
+
+    Interval feeds are due interval_minutes after their last fetch. Cron
+    feeds are due at the first occurrence after their last fetch, delayed
+    by a fixed per-feed offset so feeds sharing a schedule do not all start
+    on the same tick. Feeds that were never fetched are due now, plus the
+    same offset.
+
+    Args:
+        feed (Document or dict): Feed Setup with its schedule and last_fetch
+        now (datetime, optional): Current time. Defaults to now_datetime().
+
+    Returns:
+        datetime: Next run time
+    """
+    now = now or now_datetime()
+    last_fetch = get_datetime(feed.last_fetch).replace(tzinfo=None) if feed.last_fetch else None
+    
+    if feed.schedule_type == "Interval" and cint(feed.interval_minutes) > 0:
+        if last_fetch:
+            return last_fetch + timedelta(minutes=cint(feed.interval_minutes))
+        return now + timedelta(seconds=get_schedule_jitter(feed.name, cint(feed.interval_minutes) * 60))
+    
+    if feed.schedule_type == "Cron Expression" and feed.cron_expression:
+        cron = croniter.croniter(feed.cron_expression, last_fetch or now)
+        next_run = cron.get_next(datetime)
+        period = (cron.get_next(datetime) - next_run).total_seconds()
+        jitter = timedelta(seconds=get_schedule_jitter(feed.name, period))
+        return (next_run if last_fetch else now) + jitter
+    
+    return None
+
+def get_schedule_jitter(feed_name, period):
+    """Return a stable offset in seconds for a feed, at most a tenth of its period"""
+    max_jitter = cint(frappe.conf.get("supplier_feed_max_schedule_jitter") or DEFAULT_MAX_SCHEDULE_JITTER)
+    max_jitter = int(min(max_jitter, period / 10))
+    if max_jitter < 1:
+        return 0
+    return int(hashlib.sha1(str(feed_name).encode("utf-8")).hexdigest()[:8], 16) % max_jitter
 
 def check_feeds_to_fetch():
-    """Check which feeds need to be fetched based on their schedule"""
-    now = datetime.now()
+    """Queue a fetch job for every enabled feed that is due
     
-    # Get all enabled feeds
-    feeds = frappe.get_all(
-        "Feed Setup", 
-        filters={"enabled": 1},
-        fields=["name", "schedule_type", "cron_expression", "interval_minutes", "last_fetch"]
+    Served by the (enabled, next_run_at) index, so a tick with nothing due
+    costs one index lookup however many feeds there are.
+    """
+    due = frappe.get_all(
+        "Feed Setup",
+        filters={"enabled": 1, "next_run_at": ["<=", now_datetime()]},
+        pluck="name",
+        order_by="next_run_at asc"
     )
     
-    for feed in feeds:
-        should_fetch = False
-        
-        if feed.schedule_type == "Interval" and feed.interval_minutes:
-            # Check if interval has passed since last fetch
-            if not feed.last_fetch:
-                should_fetch = True
-            else:
-                last_fetch = get_datetime(feed.last_fetch)
-                time_diff = (now - last_fetch.replace(tzinfo=None)).total_seconds() / 60
-                if time_diff >= feed.interval_minutes:
-                    should_fetch = True
+    for feed in due:
+        # Each feed runs in its own job so a slow supplier cannot hold up the others
+        frappe.enqueue(
+            "supplier_feed.supplier_feed.doctype.feed_setup.feed_setup.fetch_feed_job",
+            queue="long",
+            timeout=FETCH_LOCK_TIMEOUT,
+            job_id=f"supplier_feed::fetch::{feed}",
+            deduplicate=True,
+            feed_setup=feed
+        )
+
+def fetch_feed_job(feed_setup):
+    """Background job that fetches a single feed
+    
+    The feed is skipped if another job is already fetching it, or if the
+    feed's host already has the maximum number of fetches running. In both
+    cases the feed stays due and is picked up again by the next tick.
+    """
+    with feed_lock(feed_setup) as acquired:
+        if not acquired:
+            return
         
-        elif feed.schedule_type == "Cron Expression" and feed.cron_expression:
-            # Check if cron expression matches current time
-            try:
-                cron = croniter.croniter(feed.cron_expression, now)
-                prev_execution = cron.get_prev(datetime)
-                
-                if not feed.last_fetch:
-                    should_fetch = True
-                else:
-                    last_fetch = get_datetime(feed.last_fetch)
-                    # If the previous execution time is after the last fetch, we should fetch
-                    if prev_execution > last_fetch.replace(tzinfo=None):
-                        should_fetch = True
-            except Exception as e:
-                frappe.log_error(f"Cron evaluation error for feed {feed.name}: {str(e)}", "Feed Schedule Error")
+        feed_doc = frappe.get_doc("Feed Setup", feed_setup)
+        host = urlparse(feed_doc.feed_url).hostname or feed_doc.feed_url
         
-        if should_fetch:
+        with host_slot(host) as slot_free:
+            if not slot_free:
+                return
+            
             try:
-                feed_doc = frappe.get_doc("Feed Setup", feed.name)
                 feed_doc.fetch_feed()
             except Exception as e:
-                frappe.log_error(f"Error fetching feed {feed.name}: {str(e)}", "Feed Fetch Error")
\ No newline at end of file
+                frappe.log_error(f"Error fetching feed {feed_setup}: {str(e)}", "Feed Fetch Error")
+
+def on_doctype_update():
+    frappe.db.add_index("Feed Setup", ["enabled", "next_run_at"], index_name="enabled_next_run_at")
\ No newline at end of file
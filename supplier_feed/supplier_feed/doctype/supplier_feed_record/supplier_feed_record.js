@@ -64,18 +64,11 @@ frappe.ui.form.on('Supplier Feed Record', {
             }
             
             frappe.call({
-                method: "frappe.client.get_list",
-                args: {
-                    doctype: "Item",
-                    filters: {
-                        item_code: frm.doc.item_code
-                    },
-                    fields: ["name", "item_name"]
-                },
+                method: "find_item",
+                doc: frm.doc,
                 callback: function(r) {
-                    if (r.message && r.message.length > 0) {
-                        frm.set_value("mapped_item", r.message[0].name);
-                        frm.save();
+                    if (r.message) {
+                        frm.reload_doc();
                         frappe.msgprint(__("Item found and linked"));
                     } else {
                         frappe.msgprint(__("No matching item found"));
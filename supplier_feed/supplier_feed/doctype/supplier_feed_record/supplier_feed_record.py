@@ -1,14 +1,46 @@
 import frappe
+import json
 from frappe.model.document import Document
-from frappe.utils import now
+from frappe.utils import now, flt
+from supplier_feed.supplier_feed.utils.item_matcher import match_feed_records
+from supplier_feed.supplier_feed.utils.item_sync import get_item_changes
+from supplier_feed.supplier_feed.utils.stock_sync import get_stock_warehouse, get_records_with_stock, post_stock_levels
+from supplier_feed.supplier_feed.utils.feed_stats import update_record_counts
+from supplier_feed.supplier_feed.utils.feed_payloads import get_payloads
 
 class SupplierFeedRecord(Document):
+    def onload(self):
+        # Compressed payloads are only decoded when the record is opened
+        if self.raw_data_payload and not self.raw_data:
+            payload = get_payloads([self.raw_data_payload]).get(self.raw_data_payload)
+            if payload:
+                self.raw_data = json.dumps(json.loads(payload), indent=2)
+    
     def before_insert(self):
         self.creation_date = now()
         self.modified_date = now()
     
     def before_save(self):
         self.modified_date = now()
+        
+        # Raw data decoded for display stays in the shared payload
+        if self.raw_data_payload:
+            self.raw_data = None
+    
+    def after_insert(self):
+        # Feed ingestion counts its inserts in bulk, see DocumentRecordWriter
+        if self.flags.skip_record_count:
+            return
+        update_record_counts({(self.feed_setup, self.status): 1})
+    
+    def on_update(self):
+        # Inserts are counted in after_insert, where there is no previous version
+        previous = self.get_doc_before_save()
+        if previous and (previous.status != self.status or previous.feed_setup != self.feed_setup):
+            update_record_counts({(previous.feed_setup, previous.status): -1, (self.feed_setup, self.status): 1})
+    
+    def on_trash(self):
+        update_record_counts({(self.feed_setup, self.status): -1})
     
     @frappe.whitelist()
     def approve(self):
@@ -24,6 +56,13 @@ class SupplierFeedRecord(Document):
         self.save()
         return True
     
+    @frappe.whitelist()
+    def find_item(self):
+        """Link this record to an Item using the feed's match order"""
+        feed_setup = frappe.get_doc("Feed Setup", self.feed_setup)
+        stats = match_feed_records(feed_setup, record_names=[self.name], overwrite=True)
+        return frappe.db.get_value(self.doctype, self.name, "mapped_item") if stats["matched"] else None
+    
     @frappe.whitelist()
     def sync_to_item(self):
         """Sync the feed record to an Item"""
@@ -34,30 +73,35 @@ class SupplierFeedRecord(Document):
             frappe.throw("Only approved records can be synced")
         
         try:
-            item = frappe.get_doc("Item", self.mapped_item)
-            
-            # Update item fields based on feed record
-            if self.item_name:
-                item.item_name = self.item_name
+            current = frappe.db.get_value(
+                "Item", self.mapped_item, ["name", "item_name", "description"], as_dict=True
+            )
+            if not current:
+                frappe.throw(f"Item {self.mapped_item} not found")
             
-            if self.description:
-                item.description = self.description
+            # Only load and save the Item if its own fields change
+            changes = get_item_changes(self, current)
             
             # Update price list if price is available
             if self.price and self.currency:
-                self.update_item_price(item.name)
+                self.update_item_price(current.name)
             
-            # Update stock if stock quantity is available
-            if self.stock_qty is not None:
-                self.update_item_stock(item.name)
+            # Update stock if the feed item had a stock quantity
+            self.update_item_stock(current.name)
             
-            item.save()
+            if changes:
+                item = frappe.get_doc("Item", current.name)
+                item.update(changes)
+                item.save()
             
             # Update status
             self.status = "Synced"
             self.save()
             
-            frappe.msgprint(f"Item {item.name} updated successfully")
+            if changes:
+                frappe.msgprint(f"Item {current.name} updated successfully")
+            else:
+                frappe.msgprint(f"Item {current.name} is up to date, only price and stock were synced")
             return True
         
         except Exception as e:
@@ -81,14 +125,14 @@ class SupplierFeedRecord(Document):
                 "price_list": default_price_list,
                 "currency": self.currency
             },
-            "name"
+            ["name", "price_list_rate"],
+            as_dict=True
         )
         
         if existing_price:
-            # Update existing price
-            price_doc = frappe.get_doc("Item Price", existing_price)
-            price_doc.price_list_rate = self.price
-            price_doc.save()
+            # Update existing price in place, the rest of the row is unchanged
+            if flt(existing_price.price_list_rate) != flt(self.price):
+                frappe.db.set_value("Item Price", existing_price.name, "price_list_rate", self.price)
         else:
             # Create new price
             price_doc = frappe.new_doc("Item Price")
@@ -99,8 +143,26 @@ class SupplierFeedRecord(Document):
             price_doc.insert()
     
     def update_item_stock(self, item_code):
-        """Update item stock"""
-        # This is a simplified implementation
-        # In a real-world scenario, you might want to create a Stock Entry or update Bin
-        frappe.msgprint(f"Stock quantity updated to {self.stock_qty} for item {item_code}")
-        # Implementation would depend on your inventory management approach
\ No newline at end of file
+        """Set the stock level in the feed's warehouse with a Stock Reconciliation"""
+        warehouse = get_stock_warehouse(self.feed_setup)
+        if not warehouse or self.name not in get_records_with_stock(self.feed_setup, [self.name]):
+            return
+        
+        result = post_stock_levels(warehouse, {item_code: self.stock_qty})
+        if result["posted"]:
+            frappe.msgprint(f"Stock quantity updated to {self.stock_qty} for item {item_code} in {warehouse}")
+
+RECORD_INDEXES = {
+    "feed_status_creation_date": ["feed_setup", "status", "creation_date"],
+    "feed_status_modified_date": ["feed_setup", "status", "modified_date"],
+    "feed_setup_creation_date": ["feed_setup", "creation_date"],
+    "item_code_feed_setup": ["item_code", "feed_setup"],
+    "status_creation_date": ["status", "creation_date"],
+    "creation_date": ["creation_date"],
+    "raw_data_payload": ["raw_data_payload"]
+}
+
+def on_doctype_update():
+    """Composite indexes for the list view, dashboard, retention and item matching queries"""
+    for index_name, fields in RECORD_INDEXES.items():
+        frappe.db.add_index("Supplier Feed Record", fields, index_name=index_name)
\ No newline at end of file
@@ -10,5 +10,28 @@ frappe.listview_settings['Supplier Feed Record'] = {
         } else if (doc.status === "Synced") {
             return [__("Synced"), "blue", "status,=,Synced"];
         }
+    },
+    onload: function(listview) {
+        listview.page.add_action_item(__("Approve"), function() {
+            frappe.call({
+                method: "supplier_feed.supplier_feed.utils.item_sync.bulk_approve",
+                args: {
+                    names: listview.get_checked_items(true)
+                },
+                callback: function(r) {
+                    frappe.msgprint(__("{0} records approved", [r.message || 0]));
+                    listview.refresh();
+                }
+            });
+        });
+        
+        listview.page.add_action_item(__("Sync to Items"), function() {
+            frappe.call({
+                method: "supplier_feed.supplier_feed.utils.item_sync.enqueue_bulk_sync",
+                args: {
+                    names: listview.get_checked_items(true)
+                }
+            });
+        });
     }
 };
\ No newline at end of file
@@ -14,13 +14,14 @@ class FeedDashboard {
         this.page = page;
         this.feeds = [];
         this.records = [];
+        this.runs = [];
         this.setup_page();
         this.load_data();
     }
     
     setup_page() {
         // Add refresh button
-        this.page.set_primary_action('Refresh', () => this.load_data(), 'refresh');
+        this.page.set_primary_action('Refresh', () => this.load_data(true), 'refresh');
         
         // Add button to create new feed
         this.page.set_secondary_action('New Feed Setup', () => {
@@ -33,7 +34,7 @@ class FeedDashboard {
                 method: "supplier_feed.supplier_feed.doctype.feed_setup.feed_setup.check_feeds_to_fetch",
                 callback: (r) => {
                     frappe.msgprint(__("Feed fetch process initiated"));
-                    setTimeout(() => this.load_data(), 3000);
+                    setTimeout(() => this.load_data(true), 3000);
                 }
             });
         });
@@ -45,6 +46,10 @@ class FeedDashboard {
                     <h5>Feed Setups</h5>
                     <div class="feed-setups-container"></div>
                 </div>
+                <div class="feed-section">
+                    <h5>Recent Fetch Runs</h5>
+                    <div class="feed-runs-container"></div>
+                </div>
                 <div class="feed-section">
                     <h5>Recent Feed Records</h5>
                     <div class="feed-records-container"></div>
@@ -71,55 +76,22 @@ class FeedDashboard {
         });
     }
     
-    load_data() {
-        this.load_feeds();
-        this.load_records();
-        this.load_stats();
-    }
-    
-    load_feeds() {
+    load_data(refresh) {
+        // Counts, feeds, runs and recent records come from one cached endpoint
         frappe.call({
-            method: 'frappe.client.get_list',
+            method: 'supplier_feed.supplier_feed.page.feed_dashboard.feed_dashboard.get_dashboard_data',
             args: {
-                doctype: 'Feed Setup',
-                fields: ['name', 'feed_name', 'supplier', 'feed_format', 'enabled', 'last_fetch', 'feed_url'],
-                limit: 50,
-                order_by: 'modified desc'
+                refresh: refresh ? 1 : 0
             },
             callback: (r) => {
-                this.feeds = r.message || [];
+                const data = r.message || {};
+                this.feeds = data.feeds || [];
+                this.runs = data.recent_runs || [];
+                this.records = data.recent_records || [];
                 this.render_feeds();
-            }
-        });
-    }
-    
-    load_records() {
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Supplier Feed Record',
-                fields: ['name', 'feed_setup', 'supplier', 'status', 'item_code', 'item_name', 'creation_date'],
-                limit: 20,
-                order_by: 'creation_date desc'
-            },
-            callback: (r) => {
-                this.records = r.message || [];
+                this.render_runs();
                 this.render_records();
-            }
-        });
-    }
-    
-    load_stats() {
-        frappe.call({
-            method: 'frappe.client.get_list',
-            args: {
-                doctype: 'Supplier Feed Record',
-                fields: ['status', 'COUNT(*) as count'],
-                group_by: 'status'
-            },
-            callback: (r) => {
-                const stats = r.message || [];
-                this.render_stats(stats);
+                this.render_stats(data.status_counts || []);
             }
         });
     }
@@ -142,6 +114,7 @@ class FeedDashboard {
                             <th>Format</th>
                             <th>Status</th>
                             <th>Last Fetch</th>
+                            <th>Pending / Total Records</th>
                             <th>Actions</th>
                         </tr>
                     </thead>
@@ -152,6 +125,8 @@ class FeedDashboard {
             const status = feed.enabled ? 
                 '<span class="indicator green">Enabled</span>' : 
                 '<span class="indicator gray">Disabled</span>';
+            const counts = feed.record_counts || {};
+            const total = Object.values(counts).reduce((sum, count) => sum + count, 0);
             
             html += `
                 <tr>
@@ -160,6 +135,7 @@ class FeedDashboard {
                     <td>${feed.feed_format}</td>
                     <td>${status}</td>
                     <td>${feed.last_fetch || 'Never'}</td>
+                    <td>${counts.Pending || 0} / ${total}</td>
                     <td>
                         <button class="btn btn-xs btn-default fetch-feed" data-feed="${feed.name}">
                             Fetch Now
@@ -184,6 +160,75 @@ class FeedDashboard {
         });
     }
     
+    render_runs() {
+        const container = this.page.main.find('.feed-runs-container');
+        
+        if (this.runs.length === 0) {
+            container.html('<div class="text-muted">No fetch runs yet</div>');
+            return;
+        }
+        
+        const indicators = {
+            'Running': 'orange',
+            'Success': 'green',
+            'Not Modified': 'gray',
+            'Failed': 'red',
+            'Interrupted': 'red'
+        };
+        
+        let html = `
+            <div class="table-responsive">
+                <table class="table table-bordered">
+                    <thead>
+                        <tr>
+                            <th>Feed Setup</th>
+                            <th>Status</th>
+                            <th>Started</th>
+                            <th>Duration</th>
+                            <th>Items</th>
+                            <th>Rows/sec</th>
+                            <th>Fetched</th>
+                        </tr>
+                    </thead>
+                    <tbody>
+        `;
+        
+        this.runs.forEach(run => {
+            html += `
+                <tr>
+                    <td><a href="/app/feed-run/${run.name}">${run.feed_setup}</a></td>
+                    <td><span class="indicator ${indicators[run.status] || ''}">${run.status}</span></td>
+                    <td>${run.started_at || ''}</td>
+                    <td>${run.duration ? run.duration.toFixed(1) + ' s' : ''}</td>
+                    <td>${run.items_processed || 0}</td>
+                    <td>${run.rows_per_sec ? Math.round(run.rows_per_sec) : ''}</td>
+                    <td>${this.format_bytes(run.bytes_fetched)}</td>
+                </tr>
+            `;
+        });
+        
+        html += `
+                    </tbody>
+                </table>
+            </div>
+        `;
+        
+        container.html(html);
+    }
+    
+    format_bytes(bytes) {
+        if (!bytes) {
+            return '';
+        }
+        const units = ['B', 'KB', 'MB', 'GB'];
+        let i = 0;
+        while (bytes >= 1024 && i < units.length - 1) {
+            bytes /= 1024;
+            i++;
+        }
+        return `${bytes.toFixed(i ? 1 : 0)} ${units[i]}`;
+    }
+    
     render_records() {
         const container = this.page.main.find('.feed-records-container');
         
@@ -363,7 +408,7 @@ class FeedDashboard {
                                     message: __("Feed fetched successfully"),
                                     indicator: 'green'
                                 });
-                                setTimeout(() => this.load_data(), 2000);
+                                setTimeout(() => this.load_data(true), 2000);
                             } else {
                                 frappe.show_alert({
                                     message: __("Failed to fetch feed. Check error logs for details."),
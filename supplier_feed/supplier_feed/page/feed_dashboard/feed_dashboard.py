@@ -0,0 +1,86 @@
+import frappe
+from frappe.utils import cint
+from supplier_feed.supplier_feed.utils.feed_stats import get_record_counts
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+RECENT_RECORDS_LIMIT = 20
+RECENT_RUNS_LIMIT = 20
+FEEDS_LIMIT = 50
+CACHE_TTL = 30
+CACHE_KEY = "supplier_feed:record_counts"
+
+
+@frappe.whitelist()
+def get_dashboard_data(refresh=False):
+    """
+    Return everything the Feed Dashboard shows in one response
+
+    Record counts come from the Feed Record Count counters and the recent
+    records and runs from index-ordered queries with a limit, so the cost
+    does not grow with the number of records. Feeds, records and runs are
+    read with the user's permissions; only the counters, which are the
+    same for everyone, are cached for a short time unless refresh is set.
+
+    Args:
+        refresh (bool, optional): Bypass the cache. Defaults to False.
+
+    Returns:
+        dict: feeds, status_counts, recent_records and recent_runs
+    """
+    frappe.has_permission(RECORD_DOCTYPE, "read", throw=True)
+
+    counts = None if cint(refresh) else frappe.cache().get_value(CACHE_KEY)
+    if counts is None:
+        counts = get_record_counts()
+        frappe.cache().set_value(CACHE_KEY, counts, expires_in_sec=CACHE_TTL)
+
+    return build_dashboard_data(counts)
+
+
+def build_dashboard_data(counts):
+    # Only feeds the user may read are shown and counted
+    permitted = set(frappe.get_list("Feed Setup", pluck="name", limit_page_length=0))
+    counts = {feed: feed_counts for feed, feed_counts in counts.items() if feed in permitted}
+
+    feeds = frappe.get_list(
+        "Feed Setup",
+        fields=["name", "feed_name", "supplier", "feed_format", "enabled", "last_fetch", "feed_url"],
+        order_by="modified desc",
+        limit=FEEDS_LIMIT
+    )
+    for feed in feeds:
+        feed.record_counts = counts.get(feed.name, {})
+
+    totals = {}
+    for feed_counts in counts.values():
+        for status, count in feed_counts.items():
+            totals[status] = totals.get(status, 0) + count
+    status_counts = [
+        {"status": status, "count": count}
+        for status, count in sorted(totals.items()) if count
+    ]
+
+    # Served by the creation_date index
+    recent_records = frappe.get_list(
+        RECORD_DOCTYPE,
+        fields=["name", "feed_setup", "supplier", "status", "item_code", "item_name", "creation_date"],
+        order_by="creation_date desc",
+        limit=RECENT_RECORDS_LIMIT
+    )
+
+    recent_runs = frappe.get_list(
+        "Feed Run",
+        fields=[
+            "name", "feed_setup", "status", "started_at", "duration",
+            "items_processed", "records_created", "bytes_fetched", "rows_per_sec"
+        ],
+        order_by="started_at desc",
+        limit=RECENT_RUNS_LIMIT
+    )
+
+    return {
+        "feeds": feeds,
+        "status_counts": status_counts,
+        "recent_records": recent_records,
+        "recent_runs": recent_runs
+    }
\ No newline at end of file
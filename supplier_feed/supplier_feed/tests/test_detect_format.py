@@ -0,0 +1,48 @@
+"""FeedParser.detect_format must recognise a feed from a prefix of it
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import pytest
+from supplier_feed.supplier_feed.utils.feed_parser import FORMAT_DETECT_SIZE, FeedParser
+
+
+@pytest.mark.parametrize("content, expected", [
+    ('<?xml version="1.0"?><items/>', "XML"),
+    ("\ufeff\r\n  <rss/>", "XML"),
+    ('[{"sku": "1"}]', "JSON"),
+    ('\n {"items": []}', "JSON"),
+    ("42", "JSON"),
+    ('"text"', "JSON"),
+    ("sku,name\n1,Saw\n2,Rake\n", "CSV"),
+    ("sku;name;price\r\n1;Saw;2\r\n", "CSV"),
+    ("sku\tname\n1\tSaw\n", "CSV"),
+    ("sku,name\n1,a,b,c,d\n", "UNKNOWN"),
+    ("sku,name", "UNKNOWN"),
+    ("just some text\nover two lines", "UNKNOWN"),
+    ("", "UNKNOWN")
+])
+def test_detects_format(content, expected):
+    assert FeedParser.detect_format(content) == expected
+    assert FeedParser.detect_format(content.encode("utf-8")) == expected
+
+
+def test_reads_only_a_prefix():
+    content = "[" + " " * FORMAT_DETECT_SIZE + "{}]"
+
+    assert FeedParser.detect_format("<" + "x" * (10 * FORMAT_DETECT_SIZE)) == "XML"
+    assert FeedParser.detect_format(content.encode("utf-8")) == "JSON"
+
+
+def test_truncated_csv_ignores_the_cut_off_line():
+    content = "sku,name,description\n" + "".join("S" * 200 + f",Item {i},{'d' * 3800}\n" for i in range(5))
+    prefix = content.encode("utf-8")[:FORMAT_DETECT_SIZE]
+
+    # The prefix ends inside the first field of the third row
+    assert prefix.count(b"\n") == 3 and b"," not in prefix.rsplit(b"\n", 1)[1]
+    assert FeedParser.detect_format(prefix) == "CSV"
+
+
+def test_truncated_scalar_is_not_json():
+    assert FeedParser.detect_format("1" * FORMAT_DETECT_SIZE) == "UNKNOWN"
\ No newline at end of file
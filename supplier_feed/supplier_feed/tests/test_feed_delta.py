@@ -0,0 +1,104 @@
+"""FeedDelta must classify feed rows against the stored item index
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import frappe
+import pytest
+from types import SimpleNamespace
+from supplier_feed.supplier_feed.utils import feed_delta
+from supplier_feed.supplier_feed.utils.feed_delta import FeedDelta, content_hash
+
+
+class IndexDB:
+    """Stands in for frappe.db, holding the index rows of one Feed Setup"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.inserted = []
+        self.queries = []
+
+    def sql(self, query, values=None):
+        if query.startswith("select"):
+            return list(self.rows)
+        self.queries.append((query, values))
+
+    def bulk_insert(self, doctype, fields, values, chunk_size=None):
+        self.inserted.extend(dict(zip(fields, row)) for row in values)
+
+
+@pytest.fixture
+def index(monkeypatch):
+    def make_delta(rows=()):
+        db = IndexDB([(item_code, content_hash(item)) for item_code, item in rows])
+        monkeypatch.setattr(frappe, "db", db, raising=False)
+        monkeypatch.setattr(frappe, "session", SimpleNamespace(user="Administrator"), raising=False)
+        monkeypatch.setattr(frappe, "generate_hash", lambda length=10: "x" * length, raising=False)
+        monkeypatch.setattr(feed_delta, "now", lambda: "2026-01-01 00:00:00")
+        return FeedDelta(SimpleNamespace(name="Feed-1")), db
+    return make_delta
+
+
+def classify(delta, item_code, item):
+    return delta.classify(item, {"item_code": item_code})
+
+
+def test_classifies_against_the_index(index):
+    delta, db = index([("A-1", {"price": 1}), ("A-2", {"price": 2}), ("A-3", {"price": 3})])
+
+    assert classify(delta, "A-1", {"price": 1}) == "unchanged"
+    assert classify(delta, "A-2", {"price": 5}) == "changed"
+    assert classify(delta, " A-4 ", {"price": 4}) == "new"
+    assert delta.save() == {"new": 1, "changed": 1, "unchanged": 1, "removed": 1}
+    assert [row["item_code"] for row in db.inserted] == ["A-4"]
+
+
+def test_rows_without_item_code_are_new(index):
+    delta, db = index()
+
+    assert classify(delta, None, {"price": 1}) == "new"
+    assert classify(delta, "  ", {"price": 1}) == "new"
+    delta.save()
+
+    assert db.inserted == []
+
+
+def test_repeated_rows_within_a_feed(index):
+    delta, db = index()
+
+    assert classify(delta, "A-1", {"price": 1}) == "new"
+    assert classify(delta, "A-1", {"price": 1}) == "unchanged"
+    assert classify(delta, "A-1", {"price": 2}) == "changed"
+    delta.save()
+
+    # Still a single new index row, with the last content
+    assert [(row["item_code"], row["content_hash"]) for row in db.inserted] == [("A-1", content_hash({"price": 2}))]
+    assert db.queries == []
+
+
+def test_item_codes_differing_in_case(index):
+    delta, db = index([("AB-1", {"price": 1}), ("EF-3", {"price": 3})])
+
+    assert classify(delta, "ab-1", {"price": 1}) == "unchanged"
+    assert classify(delta, "ef-3", {"price": 4}) == "changed"
+    assert classify(delta, "Cd-2", {"price": 2}) == "new"
+    assert classify(delta, "CD-2", {"price": 2}) == "unchanged"
+    assert delta.save() == {"new": 1, "changed": 1, "unchanged": 2, "removed": 0}
+
+    # One index row per code, under the spelling seen first
+    assert [row["item_code"] for row in db.inserted] == ["Cd-2"]
+    query, values = db.queries[0]
+    assert query.startswith("update")
+    assert values[-1] == ("EF-3",)
+
+
+def test_removed_items(index):
+    delta, db = index([("A-1", {"price": 1}), ("A-2", {"price": 2})])
+
+    classify(delta, "a-1", {"price": 1})
+
+    assert delta.save()["removed"] == 1
+    query, values = db.queries[0]
+    assert query.startswith("delete")
+    assert values == ("Feed-1", ("A-2",))
\ No newline at end of file
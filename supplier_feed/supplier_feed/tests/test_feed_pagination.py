@@ -0,0 +1,144 @@
+"""PagedFeed must yield the items of every page in page order
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import frappe
+import pytest
+import random
+import time
+from supplier_feed.supplier_feed.utils import feed_pagination
+from supplier_feed.supplier_feed.utils.feed_pagination import PagedFeed, get_json_value, get_page_items
+
+ITEMS = [{"sku": str(i)} for i in range(47)]
+
+
+class API:
+    """Serves ITEMS in pages, answering requests after a random delay"""
+
+    def __init__(self, pagination_type, page_size=10, total=True):
+        self.pagination_type = pagination_type
+        self.page_size = page_size
+        self.total = total
+        self.requests = []
+
+    def fetch_page(self, url, params, items_path=None, timeout=30):
+        self.requests.append(params)
+        time.sleep(random.random() / 100)
+        if self.pagination_type == "Page Number":
+            start = (params["page"] - 1) * self.page_size
+        else:
+            start = int(params.get("offset") or params.get("cursor") or 0)
+        items = ITEMS[start:start + self.page_size]
+
+        data = {"result": {"products": items}}
+        if self.total:
+            data["meta"] = {"total": len(ITEMS)}
+        if start + self.page_size < len(ITEMS):
+            data["next"] = str(start + self.page_size)
+        return {
+            "data": data,
+            "items": get_page_items(data, items_path),
+            "bytes_received": 10,
+            "size": 20,
+            "digest": f"{start:064x}"
+        }
+
+
+@pytest.fixture
+def api(monkeypatch):
+    def make_api(*args, **kwargs):
+        api = API(*args, **kwargs)
+        monkeypatch.setattr(feed_pagination, "fetch_page", api.fetch_page)
+        monkeypatch.setattr(feed_pagination, "get_session", lambda: None)
+        return api
+    return make_api
+
+
+def make_feed(pagination_type, **values):
+    return frappe._dict({
+        "feed_url": "http://localhost/products",
+        "pagination_type": pagination_type,
+        "page_size_parameter": "limit",
+        "page_size": 10,
+        "first_page": 1 if pagination_type == "Page Number" else 0,
+        "json_items_path": "result.products",
+        "total_count_path": "meta.total",
+        "next_cursor_path": "next",
+        "page_fetch_workers": 3,
+        **values
+    })
+
+
+@pytest.mark.parametrize("pagination_type", ["Page Number", "Offset", "Cursor"])
+@pytest.mark.parametrize("total", [True, False])
+def test_yields_pages_in_order(api, pagination_type, total):
+    api = api(pagination_type, total=total)
+    feed = PagedFeed(make_feed(pagination_type))
+
+    assert list(feed) == ITEMS
+    assert feed.pages == len(api.requests) == 5
+    assert (feed.bytes_received, feed.size) == (50, 100)
+
+
+def test_page_parameters(api):
+    api = api("Offset")
+
+    list(PagedFeed(make_feed("Offset", page_parameter="skip", page_size=None)))
+
+    assert api.requests[0] == {"skip": 0}
+    assert {params["skip"] for params in api.requests} == {0, 10, 20, 30, 40}
+
+
+def test_server_caps_the_page_size(api):
+    # Asked for 25 per page, served 10
+    api = api("Page Number")
+    feed = PagedFeed(make_feed("Page Number", page_size=25))
+
+    assert list(feed) == ITEMS
+    assert sorted(params["page"] for params in api.requests) == [1, 2, 3, 4, 5]
+
+
+def test_digest_is_in_page_order(api):
+    api("Page Number")
+    feeds = [PagedFeed(make_feed("Page Number")) for _ in range(3)]
+    for feed in feeds:
+        list(feed)
+
+    assert len({feed.digest for feed in feeds}) == 1
+
+
+def test_stops_on_a_repeated_cursor(api, monkeypatch):
+    api = api("Cursor")
+    fetch_page = api.fetch_page
+    monkeypatch.setattr(feed_pagination, "fetch_page", lambda url, params, *args: fetch_page(url, {"cursor": "0"}, *args))
+
+    assert list(PagedFeed(make_feed("Cursor"))) == ITEMS[:10] * 2
+
+
+@pytest.mark.parametrize("data, items_path, expected", [
+    ([{"a": 1}], None, [{"a": 1}]),
+    ({"meta": {"pages": 2}, "codes": [1, 2], "items": [{"a": 1}]}, None, [{"a": 1}]),
+    ({"data": {"items": [{"a": 1}]}}, "data.items", [{"a": 1}]),
+    ({"data": {"items": {"a": 1}}}, "data.items", []),
+    ({"data": {}}, "data.items", []),
+    ({"count": 3}, None, [])
+])
+def test_get_page_items(data, items_path, expected):
+    assert get_page_items(data, items_path) == expected
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("meta.total", 47),
+    ("pages.1.next", "c2"),
+    ("pages.2.next", None),
+    ("pages.x", None),
+    ("meta.total.value", None),
+    ("meta..total", 47),
+    ("", {"meta": {"total": 47}, "pages": [{"next": "c1"}, {"next": "c2"}]})
+])
+def test_get_json_value(path, expected):
+    data = {"meta": {"total": 47}, "pages": [{"next": "c1"}, {"next": "c2"}]}
+
+    assert get_json_value(data, path) == expected
\ No newline at end of file
@@ -0,0 +1,85 @@
+"""get_next_run_at must spread due feeds by a stable per-feed offset
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import frappe
+import pytest
+from datetime import datetime, timedelta
+from supplier_feed.supplier_feed.doctype.feed_setup.feed_setup import (
+    DEFAULT_MAX_SCHEDULE_JITTER, get_next_run_at, get_schedule_jitter
+)
+
+NOW = datetime(2026, 3, 2, 10, 7, 30)
+
+
+@pytest.fixture(autouse=True)
+def conf(monkeypatch):
+    conf = frappe._dict()
+    monkeypatch.setattr(frappe, "conf", conf, raising=False)
+    return conf
+
+
+def make_feed(name="Feed-1", **values):
+    return frappe._dict({"name": name, "last_fetch": None, **values})
+
+
+def test_jitter_is_stable_and_bounded():
+    offsets = [get_schedule_jitter(f"Feed-{i}", 3600) for i in range(200)]
+
+    assert offsets == [get_schedule_jitter(f"Feed-{i}", 3600) for i in range(200)]
+    assert all(0 <= offset < DEFAULT_MAX_SCHEDULE_JITTER for offset in offsets)
+    # Feeds sharing a schedule are spread out
+    assert len(set(offsets)) > 100
+
+
+def test_jitter_is_at_most_a_tenth_of_the_period():
+    assert all(get_schedule_jitter(f"Feed-{i}", 600) < 60 for i in range(200))
+    assert get_schedule_jitter("Feed-1", 5) == 0
+
+
+def test_jitter_limit_from_site_config(conf):
+    conf.supplier_feed_max_schedule_jitter = 10
+
+    assert all(get_schedule_jitter(f"Feed-{i}", 3600) < 10 for i in range(200))
+
+
+def test_interval():
+    feed = make_feed(schedule_type="Interval", interval_minutes=30, last_fetch="2026-03-02 09:50:00")
+
+    assert get_next_run_at(feed, NOW) == datetime(2026, 3, 2, 10, 20)
+
+
+def test_interval_never_fetched():
+    feed = make_feed(schedule_type="Interval", interval_minutes=30)
+
+    assert get_next_run_at(feed, NOW) == NOW + timedelta(seconds=get_schedule_jitter("Feed-1", 1800))
+
+
+def test_cron():
+    feed = make_feed(schedule_type="Cron Expression", cron_expression="0 * * * *", last_fetch="2026-03-02 09:00:05")
+    jitter = timedelta(seconds=get_schedule_jitter("Feed-1", 3600))
+
+    assert get_next_run_at(feed, NOW) == datetime(2026, 3, 2, 10) + jitter
+    assert get_next_run_at(make_feed(**{**feed, "last_fetch": None}), NOW) == NOW + jitter
+
+
+def test_cron_feeds_sharing_a_schedule():
+    runs = {
+        get_next_run_at(make_feed(f"Feed-{i}", schedule_type="Cron Expression", cron_expression="*/15 * * * *",
+                                  last_fetch="2026-03-02 10:00:00"), NOW)
+        for i in range(50)
+    }
+
+    assert len(runs) > 1
+    assert all(datetime(2026, 3, 2, 10, 15) <= run < datetime(2026, 3, 2, 10, 16, 30) for run in runs)
+
+
+@pytest.mark.parametrize("values", [
+    {},
+    {"schedule_type": "Interval", "interval_minutes": 0},
+    {"schedule_type": "Cron Expression", "cron_expression": ""}
+])
+def test_unscheduled(values):
+    assert get_next_run_at(make_feed(**values), NOW) is None
\ No newline at end of file
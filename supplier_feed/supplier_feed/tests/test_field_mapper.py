@@ -0,0 +1,86 @@
+"""MappingPlan must map feed items to Supplier Feed Record fields
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import frappe
+import pickle
+import pytest
+from supplier_feed.supplier_feed.utils.field_mapper import MappingPlan
+
+TARGETS = ["item_code", "item_name", "brand", "price", "qty"]
+
+
+def make_plan(*mappings):
+    return MappingPlan(
+        [dict(zip(("source_field", "target_field", "transform", "scale"), mapping)) for mapping in mappings],
+        TARGETS
+    )
+
+
+def test_simple_mappings():
+    plan = make_plan(("sku", "item_code"), (" name ", " item_name "))
+
+    assert plan.simple
+    assert plan.map({"sku": "A-1", "name": " Saw ", "other": 1}) == {"item_code": "A-1", "item_name": " Saw "}
+    assert plan.map({"other": 1}) == {}
+
+
+@pytest.mark.parametrize("transform, scale, value, expected", [
+    ("Trim", None, "  Saw  ", "Saw"),
+    ("Uppercase", None, " saw ", "SAW"),
+    ("Lowercase", None, " SAW ", "saw"),
+    ("Integer", None, "3.7", 3),
+    ("Float", None, "10.5", 10.5),
+    ("Float", 0.5, "1095", 547.5),
+    (None, 100, "1.5", 150.0),
+    (None, 1, "1.5", "1.5"),
+    ("Trim", None, 7, 7),
+    ("Float", None, None, None)
+])
+def test_converters(transform, scale, value, expected):
+    plan = make_plan(("price", "price", transform, scale))
+
+    assert plan.map({"price": value}) == {"price": expected}
+
+
+@pytest.mark.parametrize("source_field, expected", [
+    ("price/amount", 1095),
+    ("variants/1/size", "M"),
+    ("variants/2/size", None),
+    ("variants/size", None),
+    ("price/amount/value", None),
+    ("price/missing", None),
+    # A flat key with the same name wins over the nested path
+    ("stock/qty", 5)
+])
+def test_nested_paths(source_field, expected):
+    plan = make_plan((source_field, "qty"))
+    item = {
+        "price": {"amount": 1095},
+        "variants": [{"size": "S"}, {"size": "M"}],
+        "stock": {"qty": 1},
+        "stock/qty": 5
+    }
+
+    assert not plan.simple
+    assert plan.map(item).get("qty") == expected
+
+
+def test_validate():
+    plan = make_plan(("sku", "item_code"), ("a", "feed_setup"), ("b", ""), ("c", "missing"))
+
+    assert plan.pairs == (("sku", "item_code"),)
+    with pytest.raises(frappe.ValidationError) as error:
+        plan.validate()
+    assert "(empty), feed_setup, missing" in str(error.value)
+
+    make_plan(("sku", "item_code")).validate()
+
+
+def test_survives_pickling():
+    plan = make_plan(("sku", "item_code", "Uppercase"), ("price/amount", "price", "Float", 0.5))
+    item = {"sku": "a-1", "price": {"amount": "1095"}}
+
+    assert pickle.loads(pickle.dumps(plan)).map(item) == plan.map(item) == {"item_code": "A-1", "price": 547.5}
\ No newline at end of file
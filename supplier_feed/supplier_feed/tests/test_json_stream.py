@@ -0,0 +1,72 @@
+"""FeedParser.iter_json must return the same items with either backend
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import io
+import json
+import pytest
+from supplier_feed.supplier_feed.utils import feed_parser
+from supplier_feed.supplier_feed.utils.feed_parser import FeedParser
+
+DOCUMENTS = [
+    '[{"sku": "1", "price": 1.5e3}, {"sku": "2", "active": true, "tags": null}]',
+    '{"items": [{"a": 1}, {"a": "\\u00e9", "b": [1, {"c": null}]}]}',
+    '{"meta": {"count": 1}, "empty": [], "codes": [1, 2], "products": [{"sku": "1"}]}',
+    '{"sku": "1", "name": "Only item"}',
+    '{"meta": {"count": 0}}',
+    '[]',
+    '42'
+]
+
+NESTED = json.dumps({
+    "meta": {"supplier": "Test", "pages": [1, 2]},
+    "data": {
+        "summary": {"count": 2},
+        "products": [
+            {"sku": "1", "price": {"amount": 1095}, "texts": [{"body": "a"}]},
+            {"sku": "2", "price": {"amount": 10.5}, "texts": []}
+        ]
+    }
+})
+
+
+@pytest.fixture(params=["ijson", "stdlib"])
+def backend(request, monkeypatch):
+    if request.param == "ijson":
+        ijson = pytest.importorskip("ijson")
+        if ijson.backend == "python":
+            pytest.skip("ijson is only used with a C backend")
+    else:
+        monkeypatch.setattr(feed_parser, "ijson", None)
+    return request.param
+
+
+def iter_json(content, items_path=None):
+    return list(FeedParser.iter_json(io.BytesIO(content.encode("utf-8")), items_path))
+
+
+@pytest.mark.parametrize("content", DOCUMENTS)
+def test_matches_parse_json(backend, content):
+    assert iter_json(content) == FeedParser.parse_json(content)
+
+
+@pytest.mark.parametrize("content", DOCUMENTS)
+def test_text_stream_matches_parse_json(content):
+    assert list(FeedParser.iter_json(io.StringIO(content))) == FeedParser.parse_json(content)
+
+
+def test_items_path(backend):
+    assert iter_json(NESTED, "data.products") == json.loads(NESTED)["data"]["products"]
+
+
+@pytest.mark.parametrize("items_path", ["data.summary", "data.summary.count", "data.missing", "meta.supplier"])
+def test_items_path_without_array(backend, items_path):
+    assert iter_json(NESTED, items_path) == []
+
+
+def test_large_items(backend):
+    items = [{"sku": str(i), "description": "x" * 5000} for i in range(100)]
+
+    assert iter_json(json.dumps({"products": items})) == items
\ No newline at end of file
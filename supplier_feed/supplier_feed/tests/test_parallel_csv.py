@@ -0,0 +1,103 @@
+"""parse_csv_parallel must return the same pairs as a sequential parse
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import csv
+import os
+import pytest
+from supplier_feed.supplier_feed.utils.feed_parser import FeedParser
+from supplier_feed.supplier_feed.utils.field_mapper import MappingPlan
+from supplier_feed.supplier_feed.utils.parallel_csv import find_csv_ranges, parse_csv_parallel
+
+MAPPINGS = [
+    {"source_field": "sku", "target_field": "item_code"},
+    {"source_field": "name", "target_field": "item_name", "transform": "Trim"},
+    {"source_field": "description", "target_field": "description"},
+    {"source_field": "price", "target_field": "price", "transform": "Float"}
+]
+TARGETS = ["item_code", "item_name", "description", "price"]
+
+
+def write_feed(path, rows, stray_quote_at=None, delimiter=","):
+    """Write a feed whose descriptions hold delimiters, escaped quotes and line breaks"""
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, delimiter=delimiter)
+        writer.writerow(["sku", "name", "description", "price"])
+        for i in range(rows):
+            if i == stray_quote_at:
+                # An unquoted field with an inch mark, left as csv.writer would not write it
+                f.write(f'SKU-{i}{delimiter}Monitor 12" screen{delimiter}Flat{delimiter}99.5\r\n')
+                continue
+            description = f'Item {i}, size "L"; colour red'
+            if i % 7 == 0:
+                description += "\nSecond line\r\nThird line"
+            writer.writerow([f"SKU-{i}", f" Item {i} ", description, f"{i}.95"])
+
+
+def parse_sequential(path, plan):
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return [(item, plan.map(item)) for item in FeedParser.iter_csv(f)]
+
+
+@pytest.fixture
+def plan():
+    return MappingPlan(MAPPINGS, TARGETS)
+
+
+@pytest.mark.parametrize("workers", [1, 2, 3])
+@pytest.mark.parametrize("range_size", [64, 4096])
+def test_matches_sequential(tmp_path, plan, workers, range_size):
+    path = str(tmp_path / "feed.csv")
+    write_feed(path, 400)
+
+    # Small ranges, so multi-line quoted fields fall on range boundaries
+    assert list(parse_csv_parallel(path, plan, workers, range_size=range_size)) == parse_sequential(path, plan)
+
+
+@pytest.mark.parametrize("stray_quote_at", [0, 3, 200, 399])
+def test_stray_quote_in_unquoted_field(tmp_path, plan, stray_quote_at):
+    path = str(tmp_path / "feed.csv")
+    write_feed(path, 400, stray_quote_at=stray_quote_at)
+    expected = parse_sequential(path, plan)
+
+    assert len(expected) == 400
+    assert list(parse_csv_parallel(path, plan, 2, range_size=256)) == expected
+
+
+def test_semicolon_delimiter(tmp_path, plan):
+    path = str(tmp_path / "feed.csv")
+    write_feed(path, 300, stray_quote_at=10, delimiter=";")
+
+    assert list(parse_csv_parallel(path, plan, 2, range_size=512)) == parse_sequential(path, plan)
+
+
+def test_skips_leading_blank_lines(tmp_path):
+    path = str(tmp_path / "feed.csv")
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        f.write('\r\n\nsku;name\n1;"a\nb"\n2;c\n')
+    plan = MappingPlan([{"source_field": "name", "target_field": "item_name"}], ["item_name"])
+    expected = parse_sequential(path, plan)
+
+    assert [item for item, mapped in expected] == [{"sku": "1", "name": "a\nb"}, {"sku": "2", "name": "c"}]
+    assert list(parse_csv_parallel(path, plan, 2, range_size=8)) == expected
+
+
+def test_ranges_cover_the_file(tmp_path):
+    path = str(tmp_path / "feed.csv")
+    write_feed(path, 400)
+    size = os.path.getsize(path)
+
+    ranges = find_csv_ranges(path, 16, start=10)
+
+    assert ranges[0][0] == 10
+    assert ranges[-1][1] == size
+    assert all(end == start for (_, end), (start, _) in zip(ranges, ranges[1:]))
+
+
+def test_declines_multibyte_encodings(tmp_path, plan):
+    path = str(tmp_path / "feed.csv")
+    write_feed(path, 10)
+
+    assert parse_csv_parallel(path, plan, 2, encoding="utf-16") is None
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""Discovery of the item element of XML feeds
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import io
+import pytest
+from supplier_feed.supplier_feed.utils.feed_parser import FeedParser, _discover_xml_item_path
+
+ATOM = "http://www.w3.org/2005/Atom"
+
+FEEDS = {
+    "rss": (
+        "channel/item",
+        '<rss><channel><title>Catalogue</title><link>a</link><link>b</link>'
+        '<item><sku>1</sku><variant><size>S</size></variant><variant><size>M</size></variant></item>'
+        '<item><sku>2</sku></item>'
+        '</channel></rss>'
+    ),
+    # More categories than items, but the items are named like items
+    "rss_categories": (
+        "channel/item",
+        '<rss><channel>'
+        '<category domain="a">Tools</category><category domain="b">Garden</category><category domain="c">Home</category>'
+        '<item><title>Saw</title></item><item><title>Rake</title></item>'
+        '</channel></rss>'
+    ),
+    "namespaced": (
+        f"{{{ATOM}}}entry",
+        f'<feed xmlns="{ATOM}" xmlns:g="http://base.google.com/ns/1.0"><title>Catalogue</title>'
+        '<entry><g:id>1</g:id></entry><entry><g:id>2</g:id></entry><entry><g:id>3</g:id></entry>'
+        '</feed>'
+    ),
+    # A repeating header block is shorter than the item list
+    "header_lists": (
+        "products/p",
+        '<catalog><header><contacts><c><n>a</n></c><c><n>b</n></c></contacts></header>'
+        '<products><p sku="1"/><p sku="2"/><p sku="3"/></products></catalog>'
+    ),
+    # A list much longer than the named elements wins
+    "long_list": (
+        "rows/row",
+        '<export><items><item><a>1</a></item><item><a>2</a></item></items>'
+        '<rows><row id="1"/><row id="2"/><row id="3"/><row id="4"/><row id="5"/></rows></export>'
+    ),
+    "single_item": (
+        "product",
+        '<catalog><meta><version>1</version></meta><product><sku>1</sku></product></catalog>'
+    )
+}
+
+
+@pytest.mark.parametrize("name", FEEDS)
+def test_discovers_item_path(name):
+    path, content = FEEDS[name]
+
+    assert _discover_xml_item_path(io.BytesIO(content.encode("utf-8"))) == path
+
+
+@pytest.mark.parametrize("name", FEEDS)
+def test_parse_xml_and_iter_xml_agree(name):
+    path, content = FEEDS[name]
+    expected = FeedParser.parse_xml(content, path)
+
+    assert FeedParser.parse_xml(content) == expected
+    assert list(FeedParser.iter_xml(io.BytesIO(content.encode("utf-8")))) == expected
+
+
+def test_rss_categories_are_not_items():
+    path, content = FEEDS["rss_categories"]
+
+    assert FeedParser.parse_xml(content) == [{"title": "Saw"}, {"title": "Rake"}]
+
+
+def test_schema_records_path_and_fields():
+    path, content = FEEDS["rss"]
+    schema = {}
+
+    items = list(FeedParser.iter_xml(io.BytesIO(content.encode("utf-8")), schema=schema))
+
+    assert schema == {"item_path": "channel/item", "fields": ["sku", "variant_size"]}
+    # The stored path gives the same items without discovery
+    assert list(FeedParser.iter_xml(io.BytesIO(content.encode("utf-8")), schema["item_path"])) == items
+
+
+def test_no_item_element():
+    content = "<root><a>1</a></root>"
+
+    assert _discover_xml_item_path(io.BytesIO(content.encode("utf-8"))) is None
+    assert list(FeedParser.iter_xml(io.BytesIO(content.encode("utf-8")))) == FeedParser.parse_xml(content)
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""FeedParser.iter_xml must return the same items as FeedParser.parse_xml
+
+Needs the frappe package but no site:
+
+    pytest apps/supplier_feed/supplier_feed/supplier_feed/tests
+"""
+import io
+import pytest
+from supplier_feed.supplier_feed.utils.feed_parser import FeedParser
+
+FEEDS = {
+    # Child attributes and grandchildren, flattened to child_attr and child_nested
+    "child_attr_nested": (
+        '<root><items>'
+        '<item id="1"><name>A</name><price currency="EUR">5<amount>3</amount></price></item>'
+        '<item id="2"><name> B </name><stock warehouse="main"/></item>'
+        '</items></root>'
+    ),
+    "rss": (
+        '<rss><channel><title>Catalogue</title><link>a</link><link>b</link>'
+        '<item><sku>1</sku><variant><size>S</size></variant><variant><size>M</size></variant></item>'
+        '<item><sku>2</sku></item>'
+        '</channel></rss>'
+    ),
+    "namespaced": (
+        '<feed xmlns="http://www.w3.org/2005/Atom" xmlns:g="http://base.google.com/ns/1.0">'
+        '<title>Catalogue</title>'
+        '<entry><g:id>1</g:id><g:price currency="EUR"><g:amount>2</g:amount></g:price></entry>'
+        '<entry><g:id>2</g:id></entry>'
+        '</feed>'
+    ),
+    # Items inside items, which end before their parent
+    "nested_items": (
+        '<catalog>'
+        '<item><sku>1</sku><item><sku>2</sku><item><sku>3</sku></item></item></item>'
+        '<item><sku>4</sku></item>'
+        '</catalog>'
+    )
+}
+
+
+def iter_xml(content, xpath=None):
+    return list(FeedParser.iter_xml(io.BytesIO(content.encode("utf-8")), xpath))
+
+
+@pytest.mark.parametrize("name", FEEDS)
+def test_matches_parse_xml(name):
+    expected = FeedParser.parse_xml(FEEDS[name])
+
+    assert expected
+    assert iter_xml(FEEDS[name]) == expected
+
+
+@pytest.mark.parametrize("xpath", [".//item", "./items/item", "items/*", './/item[@id="1"]'])
+def test_matches_parse_xml_with_xpath(xpath):
+    content = FEEDS["child_attr_nested"]
+
+    assert iter_xml(content, xpath) == FeedParser.parse_xml(content, xpath)
+
+
+def test_flattens_child_attributes_and_nested_elements():
+    items = iter_xml(FEEDS["child_attr_nested"], ".//item")
+
+    assert items == [
+        {"name": "A", "price_currency": "EUR", "price": "5", "price_amount": "3", "id": "1"},
+        {"name": "B", "stock_warehouse": "main", "id": "2"}
+    ]
+
+
+@pytest.mark.parametrize("xpath", [".//item", "item"])
+def test_nested_items_in_document_order(xpath):
+    items = iter_xml(FEEDS["nested_items"], xpath)
+
+    assert items == FeedParser.parse_xml(FEEDS["nested_items"], xpath)
+    assert items[0] == {"sku": "1", "item_sku": "2"}
+
+
+def test_streams_from_a_file(tmp_path):
+    path = tmp_path / "feed.xml"
+    path.write_text(FEEDS["rss"], encoding="utf-8")
+
+    assert list(FeedParser.iter_xml(str(path), "channel/item")) == FeedParser.parse_xml(FEEDS["rss"], "channel/item")
\ No newline at end of file
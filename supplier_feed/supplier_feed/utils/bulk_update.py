@@ -0,0 +1,38 @@
+import frappe
+from frappe.utils import now
+
+UPDATE_CHUNK_SIZE = 1000
+
+
+def bulk_set_value(doctype, fieldname, values, update_modified=True, chunk_size=UPDATE_CHUNK_SIZE):
+    """
+    Set one field to a different value per document with set-based updates
+
+    Each chunk is written with a single UPDATE ... CASE name statement
+    instead of one query per document. Document hooks are not run.
+
+    Args:
+        doctype (str): DocType to update
+        fieldname (str): Column to set
+        values (dict): New value by document name
+        update_modified (bool, optional): Also set modified. Defaults to True.
+        chunk_size (int, optional): Documents per statement. Defaults to 1000.
+    """
+    rows = list(values.items())
+    timestamp = now()
+
+    for i in range(0, len(rows), chunk_size):
+        chunk = rows[i:i + chunk_size]
+        cases = " ".join(["when %s then %s"] * len(chunk))
+        params = [value for row in chunk for value in row]
+        set_modified = ""
+        if update_modified:
+            set_modified = ", modified = %s, modified_by = %s"
+            params += [timestamp, frappe.session.user]
+
+        frappe.db.sql(
+            f"""update `tab{doctype}`
+            set `{fieldname}` = case name {cases} end{set_modified}
+            where name in %s""",
+            params + [tuple(row[0] for row in chunk)]
+        )
\ No newline at end of file
@@ -0,0 +1,109 @@
+import frappe
+import hashlib
+import json
+from frappe.utils import now, cstr
+
+INDEX_DOCTYPE = "Feed Item Index"
+INDEX_CHUNK_SIZE = 1000
+
+
+def content_hash(item):
+    """Return a stable hash of an item's content"""
+    payload = json.dumps(item, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class FeedDelta:
+    """Classify feed rows against the item index stored for a Feed Setup
+
+    Rows are keyed on their mapped item_code. Rows without an item_code
+    cannot be tracked and are always treated as new. The index is unique
+    on item_code regardless of case, so codes are compared casefolded and
+    the index keeps the spelling it first saw.
+    """
+
+    def __init__(self, feed_setup):
+        self.feed_setup = feed_setup
+        self.known = {}
+        self.codes = {}
+        for item_code, digest in frappe.db.sql(
+            f"select item_code, content_hash from `tab{INDEX_DOCTYPE}` where feed_setup = %s",
+            feed_setup.name
+        ):
+            key = item_code.casefold()
+            self.known[key] = digest
+            self.codes[key] = item_code
+        self.seen = {}
+        self.new = {}
+        self.changed = {}
+        self.counts = {"new": 0, "changed": 0, "unchanged": 0, "removed": 0}
+
+    def classify(self, item, mapped_data):
+        """Return "new", "changed" or "unchanged" for a feed row"""
+        item_code = cstr(mapped_data.get("item_code")).strip()
+        if not item_code:
+            self.counts["new"] += 1
+            return "new"
+
+        key = item_code.casefold()
+        digest = content_hash(item)
+        previous = self.seen.get(key, self.known.get(key))
+        self.seen[key] = digest
+        self.codes.setdefault(key, item_code)
+
+        if previous is None:
+            status = "new"
+            self.new[key] = digest
+        elif previous == digest:
+            status = "unchanged"
+        else:
+            status = "changed"
+            if key in self.new:
+                # Repeated within the same feed, still new to the index
+                self.new[key] = digest
+            else:
+                self.changed[key] = digest
+
+        self.counts[status] += 1
+        return status
+
+    def save(self):
+        """Write the index changes for this fetch and count removed items"""
+        timestamp = now()
+        user = frappe.session.user
+        feed_setup = self.feed_setup.name
+
+        if self.new:
+            frappe.db.bulk_insert(
+                INDEX_DOCTYPE,
+                ["name", "creation", "modified", "owner", "modified_by",
+                 "feed_setup", "item_code", "content_hash", "last_changed"],
+                [
+                    [frappe.generate_hash(length=10), timestamp, timestamp, user, user,
+                     feed_setup, self.codes[key], digest, timestamp]
+                    for key, digest in self.new.items()
+                ],
+                chunk_size=INDEX_CHUNK_SIZE
+            )
+
+        changed = [(self.codes[key], digest) for key, digest in self.changed.items()]
+        for i in range(0, len(changed), INDEX_CHUNK_SIZE):
+            chunk = changed[i:i + INDEX_CHUNK_SIZE]
+            cases = " ".join(["when %s then %s"] * len(chunk))
+            values = [value for row in chunk for value in row]
+            frappe.db.sql(
+                f"""update `tab{INDEX_DOCTYPE}`
+                set content_hash = case item_code {cases} end, last_changed = %s, modified = %s
+                where feed_setup = %s and item_code in %s""",
+                values + [timestamp, timestamp, feed_setup, tuple(row[0] for row in chunk)]
+            )
+
+        removed = [self.codes[key] for key in self.known if key not in self.seen]
+        for i in range(0, len(removed), INDEX_CHUNK_SIZE):
+            frappe.db.sql(
+                f"delete from `tab{INDEX_DOCTYPE}` where feed_setup = %s and item_code in %s",
+                (feed_setup, tuple(removed[i:i + INDEX_CHUNK_SIZE]))
+            )
+        self.counts["removed"] = len(removed)
+
+        return self.counts
\ No newline at end of file
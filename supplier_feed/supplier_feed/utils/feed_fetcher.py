@@ -0,0 +1,303 @@
+import codecs
+import gzip
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+import zlib
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import brotli  # noqa: F401
+    HAS_BROTLI = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        HAS_BROTLI = True
+    except ImportError:
+        HAS_BROTLI = False
+
+# Bodies up to this size stay in memory, larger ones roll over to disk
+SPOOL_MAX_MEMORY = 8 * 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# Brotli is only advertised when urllib3 can decode it
+ACCEPT_ENCODING = "gzip, deflate, br" if HAS_BROTLI else "gzip, deflate"
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.5
+POOL_SIZE = 16
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZIP_MAGIC = b"PK\x03\x04"
+ZLIB_MAGICS = (b"\x78\x01", b"\x78\x5e", b"\x78\x9c", b"\x78\xda")
+
+
+class FeedDownload:
+    """A downloaded feed body held in a spooled temporary file"""
+
+    def __init__(self, file, encoding=None, headers=None, bytes_received=0, digest=None, status_code=200,
+                 size=0, timings=None):
+        self.file = file
+        self.encoding = encoding
+        self.headers = headers or {}
+        self.bytes_received = bytes_received
+        self.digest = digest
+        self.status_code = status_code
+        # Size of the body after decompression
+        self.size = size
+        # Seconds spent receiving ("download") and decompressing ("decode") the body
+        self.timings = timings or {}
+        self.path = None
+
+    @property
+    def not_modified(self):
+        """True when the server answered a conditional request with 304"""
+        return self.status_code == 304
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def open_binary(self):
+        """Return the decompressed body as a binary file positioned at the start"""
+        self.file.seek(0)
+        return self.file
+
+    def open_text(self):
+        """Return the decompressed body as a text stream"""
+        return io.TextIOWrapper(
+            _NonClosingWrapper(self.open_binary()),
+            encoding=self.encoding or "utf-8-sig",
+            errors="replace",
+            newline=""
+        )
+
+    def get_path(self):
+        """
+        Return the path of a named file holding the decompressed body
+
+        The spooled body may only live in memory, so it is copied once to a
+        named temporary file that other processes can open. The file is
+        removed by close().
+        """
+        if not self.path:
+            with tempfile.NamedTemporaryFile(suffix=".feed", delete=False) as named:
+                shutil.copyfileobj(self.open_binary(), named, CHUNK_SIZE)
+                self.path = named.name
+        return self.path
+
+    def close(self):
+        if self.file:
+            self.file.close()
+        if self.path:
+            os.unlink(self.path)
+            self.path = None
+
+
+class _NonClosingWrapper(io.BufferedIOBase):
+    """Keep the spooled file open when a TextIOWrapper around it is collected"""
+
+    def __init__(self, raw):
+        self._raw = raw
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def read(self, size=-1):
+        return self._raw.read(size)
+
+    def read1(self, size=-1):
+        return self._raw.read(size)
+
+    def readline(self, size=-1):
+        return self._raw.readline(size)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._raw.seek(offset, whence)
+
+    def tell(self):
+        return self._raw.tell()
+
+    def close(self):
+        pass
+
+
+_session = None
+
+
+def get_session():
+    """
+    Return the HTTP session shared by all fetches of this process
+
+    Connections are pooled per host, so repeated fetches and the pages of
+    a paginated feed reuse open TCP and TLS connections. Connection errors
+    and 429 and 5xx answers are retried with exponential backoff, honouring
+    Retry-After.
+    """
+    global _session
+    if _session is None:
+        retry = Retry(
+            total=MAX_RETRIES,
+            backoff_factor=RETRY_BACKOFF,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=retry)
+        session = requests.Session()
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+        _session = session
+    return _session
+
+
+def download_feed(url, timeout=30, etag=None, last_modified=None, params=None):
+    """
+    Stream a feed body to a spooled temporary file
+
+    The request goes through the shared session of get_session(). The
+    response is read in chunks and never decoded to a str. HTTP transfer
+    compression is handled by requests; gzip, zip and zlib compressed files
+    are unpacked into a second spooled file. A SHA-256 digest of the body is
+    computed while it is written, and the time spent downloading and
+    decompressing is recorded in the result's timings.
+
+    Args:
+        url (str): Feed URL
+        timeout (int, optional): Request timeout in seconds. Defaults to 30.
+        etag (str, optional): ETag of the last fetch, sent as If-None-Match
+        last_modified (str, optional): Last-Modified of the last fetch, sent
+                                       as If-Modified-Since
+        params (dict, optional): Query parameters added to the URL
+
+    Returns:
+        FeedDownload: Downloaded body, to be closed by the caller. When the
+                      server answers 304 it has no file and not_modified is set.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    start = time.perf_counter()
+    with get_session().get(url, timeout=timeout, stream=True, headers=headers, params=params) as response:
+        if response.status_code == 304:
+            return FeedDownload(
+                None, headers=response.headers, status_code=304,
+                timings={"download": time.perf_counter() - start}
+            )
+        response.raise_for_status()
+
+        spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+        digest = hashlib.sha256()
+        try:
+            for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                if chunk:
+                    spool.write(chunk)
+                    digest.update(chunk)
+            # Bytes read from the connection, before any Content-Encoding is decoded
+            bytes_received = response.raw.tell()
+            downloaded = time.perf_counter()
+            spool.seek(0)
+            body = _decompress(spool)
+            size = body.seek(0, io.SEEK_END)
+            body.seek(0)
+        except Exception:
+            spool.close()
+            raise
+
+        return FeedDownload(
+            body,
+            encoding=_get_declared_encoding(response),
+            headers=response.headers,
+            bytes_received=bytes_received,
+            digest=digest.hexdigest(),
+            status_code=response.status_code,
+            size=size,
+            timings={"download": downloaded - start, "decode": time.perf_counter() - downloaded}
+        )
+
+
+def _get_declared_encoding(response):
+    """Return the charset from the Content-Type header, if one is declared"""
+    content_type = response.headers.get("Content-Type", "")
+    if "charset=" not in content_type.lower():
+        return None
+
+    encoding = requests.utils.get_encoding_from_headers(response.headers)
+    try:
+        if codecs.lookup(encoding).name == "utf-8":
+            # Let the decoder strip a BOM if the supplier sends one
+            return "utf-8-sig"
+    except LookupError:
+        return None
+    return encoding
+
+
+def _decompress(spool):
+    """Unpack a compressed body into a new spooled file, or return it unchanged"""
+    magic = spool.read(4)
+    spool.seek(0)
+
+    if magic.startswith(GZIP_MAGIC):
+        source = gzip.GzipFile(fileobj=spool, mode="rb")
+    elif magic.startswith(ZIP_MAGIC):
+        archive = zipfile.ZipFile(spool)
+        members = [info for info in archive.infolist() if not info.is_dir()]
+        if not members:
+            raise ValueError("Zip archive does not contain any files")
+        source = archive.open(members[0])
+    elif magic[:2] in ZLIB_MAGICS:
+        source = io.BufferedReader(_ZlibStream(spool))
+    else:
+        return spool
+
+    unpacked = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    try:
+        shutil.copyfileobj(source, unpacked, CHUNK_SIZE)
+    except Exception:
+        unpacked.close()
+        raise
+    spool.close()
+    unpacked.seek(0)
+    return unpacked
+
+
+class _ZlibStream(io.RawIOBase):
+    """Read-only stream that inflates zlib data from another file"""
+
+    def __init__(self, source):
+        self._source = source
+        self._decompressor = zlib.decompressobj()
+        self._buffer = b""
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        while not self._buffer and not self._decompressor.eof:
+            chunk = self._source.read(CHUNK_SIZE)
+            if not chunk:
+                self._buffer = self._decompressor.flush()
+                break
+            self._buffer = self._decompressor.decompress(chunk)
+
+        size = min(len(b), len(self._buffer))
+        b[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        return size
\ No newline at end of file
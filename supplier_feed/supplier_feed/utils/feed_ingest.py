@@ -0,0 +1,132 @@
+import frappe
+from frappe.utils import now, cint, flt
+from supplier_feed.supplier_feed.utils.feed_stats import update_record_counts
+from supplier_feed.supplier_feed.utils.feed_payloads import PayloadStore, dump_raw_data
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+DEFAULT_BATCH_SIZE = 1000
+
+
+class DocumentRecordWriter:
+    """Create Supplier Feed Records one document at a time
+
+    The record counters are added up and updated in flush() rather than in
+    the after_insert hook, so the counter row is not locked for the whole
+    run.
+    """
+
+    def __init__(self, feed_setup):
+        self.feed_setup = feed_setup
+        self.storage = feed_setup.raw_data_storage
+        self.payloads = PayloadStore() if self.storage == "Compressed" else None
+        self.count = 0
+        self.counts = {}
+
+    def add(self, item, mapped_data):
+        feed_record = frappe.new_doc(RECORD_DOCTYPE)
+        feed_record.feed_setup = self.feed_setup.name
+        feed_record.supplier = self.feed_setup.supplier
+        if self.payloads:
+            feed_record.raw_data_payload = self.payloads.add(item)
+            self.payloads.flush()
+        else:
+            feed_record.raw_data = dump_raw_data(item, self.storage)
+
+        # Mapped fields were validated when the mapping plan was compiled
+        feed_record.update(mapped_data)
+
+        feed_record.flags.skip_record_count = True
+        feed_record.insert(ignore_permissions=True)
+        key = (feed_record.feed_setup, feed_record.status)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        self.count += 1
+
+    def flush(self):
+        if self.counts:
+            update_record_counts(self.counts)
+            self.counts = {}
+
+
+class BulkRecordWriter:
+    """Create Supplier Feed Records in chunks with multi-row inserts
+
+    Rows are built directly from the table columns, so the document
+    lifecycle (validation, hooks, per-row timestamps) is skipped.
+    """
+
+    base_fields = [
+        "name", "creation", "modified", "owner", "modified_by", "docstatus", "idx",
+        "feed_setup", "supplier", "status", "creation_date", "modified_date", "raw_data", "raw_data_payload"
+    ]
+
+    def __init__(self, feed_setup, batch_size=None):
+        self.feed_setup = feed_setup
+        self.batch_size = cint(batch_size) or DEFAULT_BATCH_SIZE
+        self.storage = feed_setup.raw_data_storage
+        self.payloads = PayloadStore() if self.storage == "Compressed" else None
+        self.count = 0
+        self.pending = []
+
+        meta = frappe.get_meta(RECORD_DOCTYPE)
+        self.mapped_fields = [
+            field for field in feed_setup.get_mapping_plan().targets
+            if field not in self.base_fields
+        ]
+        self.casts = {field: _get_cast(meta.get_field(field)) for field in self.mapped_fields}
+
+        self.fields = self.base_fields + self.mapped_fields
+
+    def add(self, item, mapped_data):
+        self.pending.append((item, mapped_data))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.pending:
+            return
+
+        timestamp = now()
+        user = frappe.session.user
+        values = []
+        for item, mapped_data in self.pending:
+            if self.payloads:
+                raw_data, payload = None, self.payloads.add(item)
+            else:
+                raw_data, payload = dump_raw_data(item, self.storage), None
+            row = [
+                frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0, 0,
+                self.feed_setup.name, self.feed_setup.supplier, "Pending",
+                timestamp, timestamp, raw_data, payload
+            ]
+            for field in self.mapped_fields:
+                value = mapped_data.get(field)
+                cast = self.casts[field]
+                # Numeric columns are NOT NULL, a missing value is stored as 0 like the ORM does
+                row.append(cast(value) if cast else value)
+            values.append(row)
+
+        if self.payloads:
+            # Payloads first, so no record points at a missing payload
+            self.payloads.flush()
+        frappe.db.bulk_insert(RECORD_DOCTYPE, self.fields, values)
+        update_record_counts({(self.feed_setup.name, "Pending"): len(values)})
+        self.count += len(values)
+        self.pending = []
+
+
+def get_record_writer(feed_setup):
+    """Return the record writer for the ingestion mode of a Feed Setup"""
+    if feed_setup.ingestion_mode == "Bulk Insert":
+        return BulkRecordWriter(feed_setup, feed_setup.batch_size)
+    return DocumentRecordWriter(feed_setup)
+
+
+def _get_cast(df):
+    """Return the function used to coerce a value for a numeric field"""
+    if not df:
+        return None
+    if df.fieldtype in ("Int", "Check"):
+        return cint
+    if df.fieldtype in ("Float", "Currency", "Percent"):
+        return flt
+    return None
\ No newline at end of file
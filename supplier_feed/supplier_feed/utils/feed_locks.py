@@ -0,0 +1,65 @@
+import frappe
+from contextlib import contextmanager
+from redis.exceptions import LockError
+
+# Locks expire on their own if a worker dies while holding one
+FETCH_LOCK_TIMEOUT = 1800
+DEFAULT_MAX_FETCHES_PER_HOST = 2
+
+
+@contextmanager
+def feed_lock(feed_setup, timeout=FETCH_LOCK_TIMEOUT):
+    """
+    Hold a non-blocking, site-wide lock for fetching one feed
+
+    Yields:
+        bool: True if the lock was acquired, False if the feed is already
+              being fetched by another job
+    """
+    cache = frappe.cache()
+    lock = cache.lock(cache.make_key(f"supplier_feed:fetch:{feed_setup}"), timeout=timeout)
+    acquired = lock.acquire(blocking=False)
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            try:
+                lock.release()
+            except LockError:
+                # Expired while we were working
+                pass
+
+
+@contextmanager
+def host_slot(host, limit=None, timeout=FETCH_LOCK_TIMEOUT):
+    """
+    Take one of a limited number of concurrent fetch slots for a host
+
+    Each slot is a lock of its own, and the first free one is taken. Like
+    the feed locks, a slot expires on its own if the worker holding it is
+    killed. The limit comes from the supplier_feed_max_fetches_per_host
+    site config key when not given.
+
+    Yields:
+        bool: True if a slot was free, False if the host is at its limit
+    """
+    if limit is None:
+        limit = frappe.conf.get("supplier_feed_max_fetches_per_host") or DEFAULT_MAX_FETCHES_PER_HOST
+
+    cache = frappe.cache()
+    lock = None
+    for slot in range(int(limit)):
+        candidate = cache.lock(cache.make_key(f"supplier_feed:host:{host}:slot:{slot}"), timeout=timeout)
+        if candidate.acquire(blocking=False):
+            lock = candidate
+            break
+
+    try:
+        yield lock is not None
+    finally:
+        if lock:
+            try:
+                lock.release()
+            except LockError:
+                # Expired while we were working
+                pass
\ No newline at end of file
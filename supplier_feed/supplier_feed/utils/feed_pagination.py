@@ -0,0 +1,201 @@
+import hashlib
+import json
+import math
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from supplier_feed.supplier_feed.utils.feed_fetcher import download_feed, get_session, POOL_SIZE
+
+PAGINATION_TYPES = ("Page Number", "Offset", "Cursor")
+DEFAULT_PAGE_PARAMETERS = {"Page Number": "page", "Offset": "offset", "Cursor": "cursor"}
+DEFAULT_PAGE_FETCH_WORKERS = 4
+# Stop following pages after this many, in case an API never runs out
+MAX_FEED_PAGES = 10000
+
+
+class PagedFeed:
+    """Items of a paginated JSON API, in page order
+
+    The first page is fetched on its own. For page number and offset
+    pagination with a total count in the first page, the remaining pages
+    are requested concurrently by a thread pool and their items are yielded
+    in page order as soon as each page is in; at most two pages per worker
+    are held in memory. Without a total count, and for cursor pagination,
+    pages are requested one after another until one comes back short or
+    without a next cursor.
+
+    Pages are fetched with download_feed, so they share the pooled session,
+    its retries and compressed transfer. Threads never touch the database.
+    """
+
+    def __init__(self, feed_setup, profile=None, timeout=30):
+        self.profile = profile
+        self.url = feed_setup.feed_url
+        self.timeout = timeout
+        self.pagination_type = feed_setup.pagination_type
+        self.page_parameter = feed_setup.page_parameter or DEFAULT_PAGE_PARAMETERS[self.pagination_type]
+        self.page_size_parameter = feed_setup.page_size_parameter
+        self.page_size = int(feed_setup.page_size or 0)
+        self.first_page = int(feed_setup.first_page or 0)
+        self.items_path = feed_setup.json_items_path
+        self.total_count_path = feed_setup.total_count_path
+        self.next_cursor_path = feed_setup.next_cursor_path
+        self.workers = min(max(int(feed_setup.page_fetch_workers or DEFAULT_PAGE_FETCH_WORKERS), 1), POOL_SIZE)
+
+        self.pages = 0
+        self.bytes_received = 0
+        self.size = 0
+        # Seconds the consumer waited for pages to arrive
+        self.wait_time = 0.0
+        self._digest = hashlib.sha256()
+
+    @property
+    def digest(self):
+        """SHA-256 over the page digests, complete once all pages were read"""
+        return self._digest.hexdigest()
+
+    def __iter__(self):
+        get_session()
+
+        page = self.receive(fetch_page, self.url, self.get_params(0), self.items_path, self.timeout)
+        yield from page["items"]
+
+        if self.pagination_type == "Cursor":
+            yield from self.iter_cursor_pages(page)
+            return
+
+        # The server may cap the page size below the one asked for
+        page_size = len(page["items"])
+        if not page_size:
+            return
+
+        total = get_json_value(page["data"], self.total_count_path) if self.total_count_path else None
+        if total is not None:
+            pages = min(math.ceil(int(total) / page_size), MAX_FEED_PAGES)
+            yield from self.iter_pages_concurrently(range(1, pages), page_size)
+        else:
+            yield from self.iter_pages_sequentially(page_size)
+
+    def get_params(self, index, page_size=None, cursor=None):
+        """Query parameters of the page at index, counting from 0"""
+        params = {}
+        if self.page_size_parameter and self.page_size:
+            params[self.page_size_parameter] = self.page_size
+
+        if self.pagination_type == "Page Number":
+            params[self.page_parameter] = self.first_page + index
+        elif self.pagination_type == "Offset":
+            params[self.page_parameter] = index * (page_size or self.page_size)
+        elif cursor:
+            params[self.page_parameter] = cursor
+        return params
+
+    def receive(self, get_page, *args):
+        """Wait for a page, counting the time and the page's size"""
+        if self.profile:
+            # A failure here is a failed download, not a parse error
+            self.profile.stage = "download"
+        start = time.perf_counter()
+        page = get_page(*args)
+        self.wait_time += time.perf_counter() - start
+
+        self.pages += 1
+        self.bytes_received += page["bytes_received"]
+        self.size += page["size"]
+        self._digest.update(page["digest"].encode("ascii"))
+        return page
+
+    def iter_pages_concurrently(self, indexes, page_size):
+        executor = ThreadPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        indexes = iter(indexes)
+        try:
+            for index in indexes:
+                pending.append(self.submit(executor, index, page_size))
+                if len(pending) >= self.workers * 2:
+                    break
+
+            while pending:
+                page = self.receive(pending.popleft().result)
+                index = next(indexes, None)
+                if index is not None:
+                    pending.append(self.submit(executor, index, page_size))
+                yield from page["items"]
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def submit(self, executor, index, page_size):
+        return executor.submit(fetch_page, self.url, self.get_params(index, page_size), self.items_path, self.timeout)
+
+    def iter_pages_sequentially(self, page_size):
+        for index in range(1, MAX_FEED_PAGES):
+            page = self.receive(fetch_page, self.url, self.get_params(index, page_size), self.items_path, self.timeout)
+            yield from page["items"]
+
+            if len(page["items"]) < page_size:
+                return
+
+    def iter_cursor_pages(self, page):
+        seen = set()
+        for _ in range(1, MAX_FEED_PAGES):
+            cursor = get_json_value(page["data"], self.next_cursor_path)
+            if not cursor or not page["items"] or cursor in seen:
+                return
+            seen.add(cursor)
+
+            page = self.receive(fetch_page, self.url, self.get_params(0, cursor=cursor), self.items_path, self.timeout)
+            yield from page["items"]
+
+
+def fetch_page(url, params, items_path=None, timeout=30):
+    """
+    Download and decode one page of a JSON API
+
+    Args:
+        url (str): API URL
+        params (dict): Query parameters selecting the page
+        items_path (str, optional): Dot separated path to the item array
+        timeout (int, optional): Request timeout in seconds. Defaults to 30.
+
+    Returns:
+        dict: The decoded "data", its "items" and the "bytes_received",
+              "size" and "digest" of the body
+    """
+    with download_feed(url, timeout=timeout, params=params) as download:
+        data = json.load(download.open_text())
+        return {
+            "data": data,
+            "items": get_page_items(data, items_path),
+            "bytes_received": download.bytes_received,
+            "size": download.size,
+            "digest": download.digest
+        }
+
+
+def get_page_items(data, items_path=None):
+    """Return the item list of a page, found like FeedParser.parse_json without a path"""
+    if items_path:
+        items = get_json_value(data, items_path)
+        return items if isinstance(items, list) else []
+
+    if isinstance(data, list):
+        return data
+    if isinstance(data, dict):
+        for value in data.values():
+            if isinstance(value, list) and value and isinstance(value[0], dict):
+                return value
+    return []
+
+
+def get_json_value(data, path):
+    """Return the value at a dot separated path, or None if it does not exist"""
+    for part in (path or "").split("."):
+        if not part:
+            continue
+        if isinstance(data, dict):
+            data = data.get(part)
+        elif isinstance(data, list) and part.isdigit() and int(part) < len(data):
+            data = data[int(part)]
+        else:
+            return None
+    return data
\ No newline at end of file
@@ -2,9 +2,26 @@ import frappe
 import json
 import xml.etree.ElementTree as ET
 import csv
+import io
 from io import StringIO
+from collections import deque
+from itertools import chain
 import re
 
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Longest first line read to detect the CSV delimiter
+CSV_SNIFF_SIZE = 64 * 1024
+
+# Characters looked at when detecting the format of a feed
+FORMAT_DETECT_SIZE = 8 * 1024
+
+# Characters read at a time by the streaming JSON reader
+JSON_READ_SIZE = 64 * 1024
+
 class FeedParser:
     """Utility class for parsing different feed formats"""
     
@@ -26,46 +43,15 @@ class FeedParser:
             
             # Try to determine the item path if not provided
             if not xpath:
-                # Common XML structures
-                common_paths = [
-                    './/item',
-                    './/product',
-                    './/products/*',
-                    './/items/*',
-                    './/*[contains(local-name(), "product")]',
-                    './/*[contains(local-name(), "item")]'
-                ]
-                
-                for path in common_paths:
-                    elements = root.findall(path)
-                    if elements:
-                        xpath = path
-                        break
+                finder = XMLItemPathFinder()
+                finder.add_tree(root)
+                xpath = finder.get_item_path()
             
             # If we have a path, use it
             if xpath:
                 elements = root.findall(xpath)
                 for element in elements:
-                    item_data = {}
-                    for child in element:
-                        # Handle attributes
-                        for attr_name, attr_value in child.attrib.items():
-                            item_data[f"{child.tag}_{attr_name}"] = attr_value
-                        
-                        # Handle text content
-                        if child.text and child.text.strip():
-                            item_data[child.tag] = child.text.strip()
-                        
-                        # Handle nested elements
-                        for nested in child:
-                            if nested.text and nested.text.strip():
-                                item_data[f"{child.tag}_{nested.tag}"] = nested.text.strip()
-                    
-                    # Also include direct attributes of the item element
-                    for attr_name, attr_value in element.attrib.items():
-                        item_data[attr_name] = attr_value
-                    
-                    items.append(item_data)
+                    items.append(FeedParser.xml_element_to_dict(element))
             else:
                 # Fallback: try to extract all elements with their paths
                 def extract_elements(element, path=""):
@@ -93,45 +79,124 @@ class FeedParser:
         except Exception as e:
             frappe.log_error(f"XML parsing error: {str(e)}", "Feed Parse Error")
             raise
-    
+
+    @staticmethod
+    def xml_element_to_dict(element):
+        """
+        Flatten a single XML item element into a dictionary
+
+        Child text is stored under the child tag, child attributes under
+        "child_attr" and grandchild text under "child_nested". Attributes of
+        the item element itself are stored under their own name.
+
+        Args:
+            element (Element): Item element
+
+        Returns:
+            dict: Flattened item data
+        """
+        item_data = {}
+        for child in element:
+            # Handle attributes
+            for attr_name, attr_value in child.attrib.items():
+                item_data[f"{child.tag}_{attr_name}"] = attr_value
+
+            # Handle text content
+            if child.text and child.text.strip():
+                item_data[child.tag] = child.text.strip()
+
+            # Handle nested elements
+            for nested in child:
+                if nested.text and nested.text.strip():
+                    item_data[f"{child.tag}_{nested.tag}"] = nested.text.strip()
+
+        # Also include direct attributes of the item element
+        for attr_name, attr_value in element.attrib.items():
+            item_data[attr_name] = attr_value
+
+        return item_data
+
+    @staticmethod
+    def iter_xml(source, xpath=None, schema=None):
+        """
+        Incrementally parse XML from a byte stream
+
+        Elements are read with iterparse and discarded as soon as they have
+        been converted, so memory use does not grow with the size of the feed.
+        The output is the same as parse_xml for the same document.
+
+        Args:
+            source (file or str): Binary file object or path to an XML file.
+                                  Must be seekable when xpath is not given.
+            xpath (str, optional): XPath to extract items. Defaults to None.
+            schema (dict, optional): Filled with the "item_path" used and the
+                                     "fields" of the first items, so the
+                                     caller can skip discovery next time
+
+        Yields:
+            dict: Parsed data for each item element
+        """
+        try:
+            if not xpath:
+                start = source.tell() if hasattr(source, "tell") else None
+                xpath = _discover_xml_item_path(source)
+                if start is not None:
+                    source.seek(start)
+
+            if xpath:
+                steps = _compile_xml_path(xpath)
+                if steps is None:
+                    # Path uses syntax we cannot match while streaming
+                    content = source.read() if hasattr(source, "read") else open(source, "rb").read()
+                    items = FeedParser.parse_xml(content, xpath)
+                else:
+                    items = _iter_xml_items(source, steps)
+
+                if schema is None:
+                    yield from items
+                else:
+                    yield from _record_xml_schema(items, xpath, schema)
+            else:
+                yield _flatten_xml_stream(source)
+        except Exception as e:
+            frappe.log_error(f"XML parsing error: {str(e)}", "Feed Parse Error")
+            raise
+
     @staticmethod
     def parse_csv(content, delimiter=',', quotechar='"'):
         """
         Parse CSV content
         
         Args:
-            content (str): CSV content
+            content (str or file): CSV content or a text stream
             delimiter (str, optional): CSV delimiter. Defaults to ','.
             quotechar (str, optional): CSV quote character. Defaults to '"'.
         
         Returns:
             list: List of dictionaries containing parsed data
         """
+        source = content if hasattr(content, "read") else StringIO(content)
+        return list(FeedParser.iter_csv(source, delimiter, quotechar))
+    
+    @staticmethod
+    def iter_csv(stream, delimiter=',', quotechar='"'):
+        """
+        Incrementally parse CSV from a text stream
+        
+        The delimiter is sniffed from the first non-blank line and header names
+        are stripped once, so rows are produced as the stream is read and
+        memory does not grow with the size of the feed.
+        
+        Args:
+            stream (file): Text stream, opened with newline=''
+            delimiter (str, optional): CSV delimiter. Defaults to ','.
+            quotechar (str, optional): CSV quote character. Defaults to '"'.
+        
+        Yields:
+            dict: Parsed data for each row
+        """
         try:
-            items = []
-            # Try to detect the delimiter if not explicitly provided
-            if delimiter == ',':
-                # Count occurrences of common delimiters
-                first_line = content.split('\n')[0] if content else ""
-                delimiters = {',': 0, ';': 0, '\t': 0, '|': 0}
-                
-                for d in delimiters:
-                    delimiters[d] = first_line.count(d)
-                
-                # Use the most frequent delimiter
-                max_count = 0
-                for d, count in delimiters.items():
-                    if count > max_count:
-                        max_count = count
-                        delimiter = d
-            
-            csv_reader = csv.DictReader(StringIO(content), delimiter=delimiter, quotechar=quotechar)
-            for row in csv_reader:
-                # Clean up keys (remove whitespace)
-                cleaned_row = {k.strip(): v for k, v in row.items()}
-                items.append(cleaned_row)
-            
-            return items
+            yield from _iter_csv_rows(stream, delimiter, quotechar)
         except Exception as e:
             frappe.log_error(f"CSV parsing error: {str(e)}", "Feed Parse Error")
             raise
@@ -142,13 +207,16 @@ class FeedParser:
         Parse JSON content
         
         Args:
-            content (str): JSON content
+            content (str or file): JSON content or a text stream
         
         Returns:
             list: List of dictionaries containing parsed data
         """
         try:
-            data = json.loads(content)
+            if hasattr(content, "read"):
+                data = json.load(content)
+            else:
+                data = json.loads(content)
             
             # Handle different JSON structures
             if isinstance(data, list):
@@ -169,30 +237,89 @@ class FeedParser:
             frappe.log_error(f"JSON parsing error: {str(e)}", "Feed Parse Error")
             raise
     
+    @staticmethod
+    def iter_json(stream, items_path=None):
+        """
+        Incrementally parse the item array of a JSON document
+        
+        Only the current item is decoded at a time. Without items_path the
+        array is found like parse_json does: a top-level array, or the first
+        key of a top-level object holding an array of objects. A C backend of
+        ijson is used for binary streams when it is installed, otherwise the
+        standard library decoder is used.
+        
+        Args:
+            stream (file): Binary or text stream. Must be seekable when ijson
+                           is used without items_path.
+            items_path (str, optional): Dot separated path to the item array,
+                                        e.g. "data.products". Nothing is
+                                        yielded if it does not lead to an
+                                        array. Defaults to None.
+        
+        Yields:
+            dict: Parsed data for each item
+        """
+        try:
+            is_binary = isinstance(stream.read(0), bytes)
+            if is_binary and ijson and ijson.backend != "python":
+                yield from _iter_json_ijson(stream, items_path)
+                return
+            
+            text = io.TextIOWrapper(stream, encoding="utf-8-sig") if is_binary else stream
+            try:
+                reader = _JSONStreamReader(text)
+                if items_path:
+                    yield from reader.iter_path([part for part in items_path.split(".") if part])
+                else:
+                    yield from reader.iter_detected()
+            finally:
+                if is_binary:
+                    # Leave the underlying stream open for the caller
+                    text.detach()
+        except Exception as e:
+            frappe.log_error(f"JSON parsing error: {str(e)}", "Feed Parse Error")
+            raise
+    
     @staticmethod
     def detect_format(content):
         """
         Detect the format of the content
         
+        Only the first FORMAT_DETECT_SIZE characters are looked at: a BOM and
+        leading whitespace are skipped, the first character decides XML and
+        JSON, and CSV is recognised from the first few complete lines.
+        
         Args:
-            content (str): Content to detect format for
+            content (str or bytes): Content, or a prefix of it, to detect format for
         
         Returns:
             str: Detected format ("XML", "CSV", "JSON", or "UNKNOWN")
         """
+        if isinstance(content, bytes):
+            content = content[:FORMAT_DETECT_SIZE].decode("utf-8", errors="ignore")
+        truncated = len(content) >= FORMAT_DETECT_SIZE
+        sample = content[:FORMAT_DETECT_SIZE].lstrip("\ufeff \t\r\n")
+        
         # Check if it's XML
-        if content.strip().startswith('<?xml') or re.match(r'^\s*<[^>]+>', content):
+        if sample.startswith('<'):
             return "XML"
         
         # Check if it's JSON
-        try:
-            json.loads(content)
+        if sample[:1] in ('{', '['):
             return "JSON"
-        except:
-            pass
+        if not truncated:
+            # Scalar documents are only recognised when they are complete
+            try:
+                json.loads(sample)
+                return "JSON"
+            except ValueError:
+                pass
         
         # Check if it's CSV (simple heuristic)
-        lines = content.strip().split('\n')
+        lines = sample.rstrip().split('\n')
+        if truncated and len(lines) > 2:
+            # The last line may have been cut off
+            lines = lines[:-1]
         if len(lines) > 1:
             header = lines[0]
             if ',' in header or ';' in header or '\t' in header:
@@ -237,4 +364,554 @@ class FeedParser:
             return FeedParser.parse_json(content)
         else:
             frappe.log_error(f"Unsupported format: {format_type}", "Feed Parse Error")
-            raise ValueError(f"Unsupported format: {format_type}")
\ No newline at end of file
+            raise ValueError(f"Unsupported format: {format_type}")
+
+    @staticmethod
+    def parse_stream(source, format_type=None, json_path=None, xml_path=None, schema=None):
+        """
+        Parse a downloaded feed without reading it into a single string
+        
+        Args:
+            source (FeedDownload): Object providing open_binary() and open_text()
+            format_type (str, optional): Format type ("XML", "CSV", "JSON"). 
+                                        If None, format will be auto-detected.
+            json_path (str, optional): Dot separated path to the JSON item array
+            xml_path (str, optional): Path of the XML item elements, discovered
+                                      when not given
+            schema (dict, optional): Filled with the XML item path and fields,
+                                     see iter_xml
+        
+        Returns:
+            iterable: Dictionaries containing parsed data
+        """
+        if format_type == "XML":
+            return FeedParser.iter_xml(source.open_binary(), xml_path, schema)
+        elif format_type == "CSV":
+            return FeedParser.iter_csv(source.open_text())
+        elif format_type == "JSON":
+            if ijson:
+                return FeedParser.iter_json(source.open_binary(), json_path)
+            return FeedParser.iter_json(source.open_text(), json_path)
+        
+        if not format_type:
+            format_type = FeedParser.detect_format(source.open_binary().read(FORMAT_DETECT_SIZE))
+            if format_type in ("XML", "CSV", "JSON"):
+                return FeedParser.parse_stream(source, format_type, json_path, xml_path, schema)
+        
+        frappe.log_error(f"Unsupported format: {format_type}", "Feed Parse Error")
+        raise ValueError(f"Unsupported format: {format_type}")
+
+
+# Elements read to discover the item path of an XML feed
+XML_DISCOVERY_ELEMENTS = 100000
+
+# Items whose fields are recorded in the learned schema of an XML feed
+XML_SCHEMA_SAMPLE_ITEMS = 50
+
+# Local names preferred as the item element, and taken as it when no element repeats
+XML_ITEM_TAGS = ("item", "product", "entry", "offer")
+
+# A candidate with an item name wins unless another repeats more than this many times as often
+XML_ITEM_TAG_PREFERENCE = 2
+
+
+class XMLItemPathFinder:
+    """Find the repeating item element of an XML document from its tag paths
+
+    Elements are counted by their full path of namespace qualified tags. An
+    item candidate is an element with child elements or attributes that
+    occurs more than once under the same parent. Candidates nested inside
+    another candidate (variants inside products) are ignored, and of the
+    rest the most frequent wins, so a short repeating header block does not
+    beat the item list. A candidate named like an item (XML_ITEM_TAGS) is
+    preferred over a more frequent sibling list, such as the categories of
+    an RSS channel, unless that list is much longer.
+    """
+
+    def __init__(self):
+        self.tags = []
+        self.siblings = [{}]
+        self.counts = {}
+        self.repeating = set()
+        self.records = set()
+        self.elements = 0
+
+    def start(self, tag, attributes=False):
+        """Count an element opened below the current one"""
+        siblings = self.siblings[-1]
+        siblings[tag] = siblings.get(tag, 0) + 1
+        self.tags.append(tag)
+        path = tuple(self.tags)
+        self.counts[path] = self.counts.get(path, 0) + 1
+        if siblings[tag] == 2:
+            self.repeating.add(path)
+        if attributes:
+            self.records.add(path)
+        if len(path) > 1:
+            self.records.add(path[:-1])
+        self.siblings.append({})
+        self.elements += 1
+
+    def end(self):
+        self.tags.pop()
+        self.siblings.pop()
+
+    def add_tree(self, element):
+        """Count an element and everything below it"""
+        self.start(element.tag, bool(element.attrib))
+        for child in element:
+            self.add_tree(child)
+        self.end()
+
+    def get_item_path(self):
+        """
+        Return the path of the item elements relative to the root
+
+        Returns:
+            str: ElementTree path such as "channel/item", with namespaced
+                 tags in {uri}tag form, or None if no item element was found
+        """
+        candidates = {path for path in self.repeating if path in self.records and len(path) > 1}
+        outermost = [
+            path for path in candidates
+            if not any(path[:i] in candidates for i in range(2, len(path)))
+        ]
+        if outermost:
+            rank = lambda path: (self.counts[path], -len(path))
+            best = max(outermost, key=rank)
+            named = [
+                path for path in outermost
+                if _local_name(path[-1]).lower() in XML_ITEM_TAGS
+                and self.counts[path] * XML_ITEM_TAG_PREFERENCE >= self.counts[best]
+            ]
+            if named:
+                best = max(named, key=rank)
+            return "/".join(best[1:])
+
+        # A feed with a single item, found by its name
+        named = [
+            path for path in self.records
+            if len(path) > 1 and _local_name(path[-1]).lower() in XML_ITEM_TAGS
+        ]
+        if named:
+            return "/".join(min(named, key=len)[1:])
+        return None
+
+
+def _local_name(tag):
+    """Return a tag without its {namespace}"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def _split_xml_path(path):
+    """Split an ElementTree path on "/" while keeping {namespace} tags intact"""
+    parts = []
+    current = ""
+    in_namespace = False
+    for char in path:
+        if char == "{":
+            in_namespace = True
+        elif char == "}":
+            in_namespace = False
+        if char == "/" and not in_namespace:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return parts
+
+
+def _compile_xml_path(xpath):
+    """
+    Compile a simple ElementTree path into matching steps
+
+    Only child ("a/b"), descendant (".//a") and wildcard ("*") steps are
+    supported. Anything else (predicates, attributes, parent steps) returns
+    None so the caller can fall back to a full parse.
+
+    Returns:
+        list: (descendant, tag) tuples, or None if the path is not supported
+    """
+    path = xpath.strip()
+    if path.startswith("./"):
+        path = path[2:]
+    elif path.startswith("/") and not path.startswith("//"):
+        return None
+
+    steps = []
+    descendant = False
+    if path.startswith("/"):
+        # ".//tag" leaves a leading "/" behind after stripping "./"
+        descendant = True
+        path = path[1:]
+
+    for part in _split_xml_path(path):
+        if part == "":
+            descendant = True
+            continue
+        if part in (".", "..") or re.search(r"[\[\]@()]", part.split("}")[-1]):
+            return None
+        steps.append((descendant, part))
+        descendant = False
+
+    return steps or None
+
+
+def _xml_path_matches(steps, tags):
+    """Check whether the tags below the root match the compiled steps"""
+    positions = {0}
+    for descendant, tag in steps:
+        next_positions = set()
+        for position in positions:
+            candidates = range(position, len(tags)) if descendant else range(position, min(position + 1, len(tags)))
+            for i in candidates:
+                if tag == "*" or tags[i] == tag:
+                    next_positions.add(i + 1)
+        positions = next_positions
+        if not positions:
+            return False
+    return len(tags) in positions
+
+
+def _discover_xml_item_path(source, limit=XML_DISCOVERY_ELEMENTS):
+    """Find the item path in one streaming pass over the first limit elements"""
+    finder = XMLItemPathFinder()
+    elements = []
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            finder.start(elem.tag, bool(elem.attrib))
+            elements.append(elem)
+            if finder.elements >= limit:
+                break
+        else:
+            finder.end()
+            elements.pop()
+            elem.clear()
+            if elements:
+                elements[-1].remove(elem)
+
+    return finder.get_item_path()
+
+
+def _record_xml_schema(items, xpath, schema):
+    """Pass items through, recording the item path and the fields of the first items"""
+    fields = {}
+    schema["item_path"] = xpath
+    schema["fields"] = []
+    for count, item in enumerate(items):
+        if count < XML_SCHEMA_SAMPLE_ITEMS:
+            fields.update(dict.fromkeys(item))
+            schema["fields"] = list(fields)
+        yield item
+
+
+def _iter_xml_items(source, steps):
+    """Yield flattened item dicts for every element matching the compiled steps
+
+    Items are yielded in the order they start, like findall returns them, so
+    an item nested in another item follows its parent although it ends first.
+    """
+    elements = []
+    matched = []
+    tags = []
+    # [converted, item] of every open or waiting item, in start order
+    pending = deque()
+    open_items = 0
+    match_cache = {}
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            slot = None
+            if elements:
+                tags.append(elem.tag)
+                tag_path = tuple(tags)
+                is_item = match_cache.get(tag_path)
+                if is_item is None:
+                    is_item = _xml_path_matches(steps, tag_path)
+                    if len(match_cache) < 1024:
+                        match_cache[tag_path] = is_item
+                if is_item:
+                    slot = [False, None]
+                    pending.append(slot)
+                    open_items += 1
+            elements.append(elem)
+            matched.append(slot)
+        else:
+            elements.pop()
+            slot = matched.pop()
+            if slot:
+                open_items -= 1
+                slot[:] = [True, FeedParser.xml_element_to_dict(elem)]
+                while pending and pending[0][0]:
+                    yield pending.popleft()[1]
+
+            if elements:
+                tags.pop()
+                # Elements outside any open item are not needed again
+                if not open_items:
+                    elem.clear()
+                    elements[-1].remove(elem)
+
+
+def _flatten_xml_stream(source):
+    """Streaming equivalent of the parse_xml fallback that flattens the whole document"""
+    result = {}
+    elements = []
+    path = []
+
+    for event, elem in ET.iterparse(source, events=("start", "end")):
+        if event == "start":
+            path.append(elem.tag)
+            current_path = "/".join(path)
+            for attr_name, attr_value in elem.attrib.items():
+                result[f"{current_path}@{attr_name}"] = attr_value
+            elements.append(elem)
+        else:
+            current_path = "/".join(path)
+            if elem.text and elem.text.strip():
+                result[current_path] = elem.text.strip()
+            path.pop()
+            elements.pop()
+            elem.clear()
+            if elements:
+                elements[-1].remove(elem)
+
+    return result
+
+
+
+def _iter_json_ijson(stream, items_path):
+    """Yield JSON items with ijson, finding the array first when no path is given"""
+    if items_path:
+        prefix = ".".join(part for part in items_path.split(".") if part)
+        yield from ijson.items(stream, f"{prefix}.item" if prefix else "item", use_float=True)
+        return
+
+    start = stream.tell()
+    prefix = None
+    current_key = None
+    array_key = None
+    for event_prefix, event, value in ijson.parse(stream):
+        if array_key is not None:
+            if event_prefix == f"{array_key}.item" and event == "start_map":
+                # Found an array of objects
+                prefix = event_prefix
+                break
+            array_key = None
+
+        if event_prefix == "":
+            if event == "start_array":
+                prefix = "item"
+                break
+            if event == "map_key":
+                current_key = value
+            elif event != "start_map":
+                break
+        elif event == "start_array" and event_prefix == current_key:
+            array_key = current_key
+
+    stream.seek(start)
+    if prefix:
+        yield from ijson.items(stream, prefix, use_float=True)
+        return
+
+    # No item array, decode the document like parse_json would
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig")
+    try:
+        items = FeedParser.parse_json(text)
+    finally:
+        text.detach()
+    yield from items
+
+
+class _JSONStreamReader:
+    """Decode JSON values one at a time from a text stream"""
+
+    whitespace = re.compile(r"[ \t\n\r]*")
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, size=JSON_READ_SIZE):
+        """Append more of the stream to the buffer, returning False at the end"""
+        if self.eof:
+            return False
+        data = self.stream.read(size)
+        if not data:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + data
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it"""
+        while True:
+            self.pos = self.whitespace.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, char):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON stream, found '{found}'")
+        self.pos += 1
+
+    def decode_value(self):
+        """Decode the next complete value, reading more of the stream as needed"""
+        while True:
+            self.peek()
+            pending = len(self.buffer) - self.pos
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Read at least as much again so large values decode in linear time
+                if not self.fill(max(JSON_READ_SIZE, pending)):
+                    raise
+                continue
+
+            if end == len(self.buffer) and self.fill(max(JSON_READ_SIZE, pending)):
+                # A number or literal may continue in the next chunk
+                continue
+
+            self.pos = end
+            return value
+
+    def iter_array_rest(self):
+        """Yield the remaining values of an array whose first value was consumed"""
+        while True:
+            char = self.peek()
+            if char == "]":
+                self.pos += 1
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or ']' in JSON array, found '{char}'")
+            self.pos += 1
+            yield self.decode_value()
+
+    def iter_array(self):
+        self.expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+        yield self.decode_value()
+        yield from self.iter_array_rest()
+
+    def iter_object_keys(self):
+        """Yield the keys of an object, the caller consumes each value"""
+        self.expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+        while True:
+            key = self.decode_value()
+            self.expect(":")
+            yield key
+            char = self.peek()
+            if char == "}":
+                self.pos += 1
+                return
+            if char != ",":
+                raise ValueError(f"Expected ',' or '}}' in JSON object, found '{char}'")
+            self.pos += 1
+
+    def iter_detected(self):
+        """Yield items using the same structure detection as parse_json"""
+        char = self.peek()
+        if char == "[":
+            yield from self.iter_array()
+            return
+        if char != "{":
+            yield {"value": self.decode_value()}
+            return
+
+        data = {}
+        for key in self.iter_object_keys():
+            if self.peek() != "[":
+                data[key] = self.decode_value()
+                continue
+
+            self.expect("[")
+            if self.peek() == "]":
+                self.pos += 1
+                data[key] = []
+                continue
+
+            first = self.decode_value()
+            if isinstance(first, dict):
+                # Found an array of objects
+                yield first
+                yield from self.iter_array_rest()
+                return
+            data[key] = [first] + list(self.iter_array_rest())
+
+        # If no array found, return the dict as a single item
+        yield data
+
+    def iter_path(self, parts):
+        """Yield the items of the array at a dot separated path"""
+        for part in parts:
+            if self.peek() != "{":
+                return
+            for key in self.iter_object_keys():
+                if key == part:
+                    break
+                self.decode_value()
+            else:
+                return
+
+        # Anything but an array holds no items, like with ijson and get_page_items
+        if self.peek() == "[":
+            yield from self.iter_array()
+
+
+def _iter_csv_rows(stream, delimiter=',', quotechar='"'):
+    """Rows of a CSV text stream as dicts, without error logging
+
+    Shared by FeedParser.iter_csv and the parallel CSV workers, which run
+    outside a Frappe site context.
+    """
+    # Blank lines before the header would hide the delimiter
+    first_line = stream.readline(CSV_SNIFF_SIZE)
+    while first_line and not first_line.strip():
+        first_line = stream.readline(CSV_SNIFF_SIZE)
+
+    # Try to detect the delimiter if not explicitly provided
+    if delimiter == ',':
+        # Count occurrences of common delimiters
+        delimiters = {',': 0, ';': 0, '\t': 0, '|': 0}
+
+        for d in delimiters:
+            delimiters[d] = first_line.count(d)
+
+        # Use the most frequent delimiter
+        max_count = 0
+        for d, count in delimiters.items():
+            if count > max_count:
+                max_count = count
+                delimiter = d
+
+    csv_reader = csv.reader(chain([first_line], stream), delimiter=delimiter, quotechar=quotechar)
+
+    # Clean up keys (remove whitespace) once, skipping leading blank lines
+    fieldnames = []
+    for row in csv_reader:
+        if row:
+            fieldnames = [name.strip() for name in row]
+            break
+
+    field_count = len(fieldnames)
+    for row in csv_reader:
+        if not row:
+            continue
+        if len(row) < field_count:
+            row += [None] * (field_count - len(row))
+        yield dict(zip(fieldnames, row))
\ No newline at end of file
@@ -0,0 +1,112 @@
+import base64
+import frappe
+import hashlib
+import json
+import zlib
+from collections import OrderedDict
+from frappe.utils import now
+
+PAYLOAD_DOCTYPE = "Feed Payload"
+COMPRESSION_LEVEL = 6
+LOOKUP_CHUNK_SIZE = 1000
+# Content hashes a PayloadStore remembers as stored, least recently used dropped first
+STORED_CACHE_SIZE = 100000
+
+
+def dump_raw_data(item, storage=None):
+    """Serialise a feed item for the raw_data field of a record
+
+    Minified drops the indentation and escapes; anything else keeps the
+    original pretty-printed format.
+    """
+    if storage in ("Minified", "Compressed"):
+        return json.dumps(item, separators=(",", ":"), ensure_ascii=False, default=str)
+    return json.dumps(item, indent=2)
+
+
+def encode_payload(text):
+    """Compress text to a base64 string that fits a text column"""
+    return base64.b64encode(zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)).decode("ascii")
+
+
+def decode_payload(data):
+    """Inverse of encode_payload"""
+    return zlib.decompress(base64.b64decode(data)).decode("utf-8")
+
+
+def get_payloads(names):
+    """
+    Return the decoded payloads with the given content hashes
+
+    Args:
+        names (list): Feed Payload names (content hashes)
+
+    Returns:
+        dict: Payload text by content hash
+    """
+    names = list(set(filter(None, names)))
+    payloads = {}
+    for i in range(0, len(names), LOOKUP_CHUNK_SIZE):
+        for row in frappe.get_all(
+            PAYLOAD_DOCTYPE,
+            filters={"name": ["in", names[i:i + LOOKUP_CHUNK_SIZE]]},
+            fields=["name", "data"]
+        ):
+            payloads[row.name] = decode_payload(row.data)
+    return payloads
+
+
+class PayloadStore:
+    """Content-addressed store of compressed raw_data
+
+    Items are keyed on the SHA-1 of their canonical JSON, so identical
+    items, within a fetch or across fetches and feeds, share one Feed
+    Payload. Payloads are written in batches by flush(); reused payloads
+    get a new modified timestamp, so purge_orphaned_payloads leaves them
+    alone while the records referring to them are written.
+    """
+
+    fields = ["name", "creation", "modified", "owner", "modified_by", "docstatus", "original_size", "data"]
+
+    def __init__(self):
+        self.pending = {}
+        self.stored = OrderedDict()
+
+    def add(self, item):
+        """Queue an item and return its content hash"""
+        text = json.dumps(item, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+        key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        if key in self.stored:
+            self.stored.move_to_end(key)
+        else:
+            self.pending[key] = text
+        return key
+
+    def flush(self):
+        """Write the queued payloads that are not stored yet"""
+        if not self.pending:
+            return
+
+        timestamp = now()
+        user = frappe.session.user
+        rows = [
+            (key, timestamp, timestamp, user, user, 0, len(text.encode("utf-8")), encode_payload(text))
+            for key, text in self.pending.items()
+        ]
+        for i in range(0, len(rows), LOOKUP_CHUNK_SIZE):
+            chunk = rows[i:i + LOOKUP_CHUNK_SIZE]
+            # One statement stores new payloads and marks existing ones as in
+            # use, so a concurrent fetch or purge cannot slip in between,
+            # see purge_orphaned_payloads
+            frappe.db.sql(
+                f"""insert into `tab{PAYLOAD_DOCTYPE}` ({", ".join(self.fields)})
+                values {", ".join(["(%s, %s, %s, %s, %s, %s, %s, %s)"] * len(chunk))}
+                on duplicate key update modified = values(modified)""",
+                [value for row in chunk for value in row]
+            )
+
+        for key in self.pending:
+            self.stored[key] = True
+        while len(self.stored) > STORED_CACHE_SIZE:
+            self.stored.popitem(last=False)
+        self.pending = {}
\ No newline at end of file
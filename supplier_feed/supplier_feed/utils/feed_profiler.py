@@ -0,0 +1,84 @@
+import cProfile
+import io
+import pstats
+import sys
+import time
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows
+    resource = None
+
+FETCH_STAGES = ("download", "decode", "parse", "map", "insert", "match")
+PROFILE_REPORT_LINES = 40
+
+
+class FetchProfile:
+    """Per-stage timings, peak memory and an optional cProfile capture of one fetch
+
+    Stages that run interleaved while a feed is streamed (parse, map and
+    insert) are timed per item by the caller and added with add(); the
+    others can be wrapped in measure(). stage always names the stage that
+    is running, so a failure can be attributed to it.
+    """
+
+    def __init__(self, enable_profiler=False):
+        self.timings = dict.fromkeys(FETCH_STAGES, 0.0)
+        self.stage = None
+        self.profiler = cProfile.Profile() if enable_profiler else None
+
+    def add(self, stage, seconds):
+        self.timings[stage] = self.timings.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def measure(self, stage):
+        self.stage = stage
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    def start(self):
+        if self.profiler:
+            self.profiler.enable()
+
+    def stop(self):
+        """
+        Stop profiling and return the values to store on the Feed Run
+
+        Returns:
+            dict: Stage timings as <stage>_time, peak_memory_mb and, when
+                  profiling, the cProfile report
+        """
+        values = {f"{stage}_time": seconds for stage, seconds in self.timings.items()}
+        values["peak_memory_mb"] = get_peak_memory_mb()
+        if self.profiler:
+            self.profiler.disable()
+            values["profile"] = self.get_report()
+        return values
+
+    def get_report(self, lines=PROFILE_REPORT_LINES):
+        """Return the top functions by cumulative time as text"""
+        output = io.StringIO()
+        stats = pstats.Stats(self.profiler, stream=output)
+        stats.strip_dirs().sort_stats("cumulative").print_stats(lines)
+        return output.getvalue()
+
+
+def get_peak_memory_mb():
+    """
+    Return the peak resident memory of this process in MB
+
+    This is the high-water mark of the whole worker process, so it only
+    grows over the lifetime of a worker.
+    """
+    if not resource:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    if sys.platform == "darwin":
+        peak /= 1024
+    return peak / 1024
\ No newline at end of file
@@ -0,0 +1,177 @@
+import frappe
+import gzip
+import json
+import os
+from frappe.utils import add_days, cint, now_datetime, nowdate
+from supplier_feed.supplier_feed.utils.feed_stats import update_record_counts
+from supplier_feed.supplier_feed.utils.feed_payloads import PAYLOAD_DOCTYPE, get_payloads
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+PURGE_CHUNK_SIZE = 1000
+# Payloads written or reused more recently than this are never purged
+PAYLOAD_GRACE_DAYS = 1
+
+# Feed Setup field holding the retention period of each status
+RETENTION_FIELDS = {
+    "Synced": "keep_synced_days",
+    "Rejected": "keep_rejected_days"
+}
+
+
+def purge_old_records():
+    """Daily job that applies the retention policy of every Feed Setup"""
+    feeds = frappe.get_all(
+        "Feed Setup",
+        fields=["name", "archive_purged_records"] + list(RETENTION_FIELDS.values())
+    )
+    for feed in feeds:
+        for status, fieldname in RETENTION_FIELDS.items():
+            days = cint(feed.get(fieldname))
+            if days <= 0:
+                continue
+            try:
+                purge_feed_records(feed.name, status, days, archive=feed.archive_purged_records)
+            except Exception as e:
+                frappe.db.rollback()
+                frappe.log_error(
+                    f"Error purging {status} records of feed {feed.name}: {str(e)}",
+                    "Feed Retention Error"
+                )
+
+    purge_orphaned_payloads()
+
+
+def purge_feed_records(feed_setup, status, days, archive=False, chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Delete records of a feed that reached a status more than the given number of days ago
+
+    The age is measured from modified_date, which is set whenever the
+    status changes, so a record synced today is kept for the full period
+    however long ago it was fetched.
+
+    Records are deleted by primary key, a chunk at a time, and each chunk is
+    committed on its own so the table is never locked for long. With archive
+    set, every chunk is first appended as gzip compressed JSON lines to a
+    private file attached to the Feed Setup.
+
+    Args:
+        feed_setup (str): Feed Setup name
+        status (str): Record status to purge
+        days (int): Keep records changed in the last this many days
+        archive (bool, optional): Write purged rows to an archive file. Defaults to False.
+        chunk_size (int, optional): Records deleted per statement. Defaults to 1000.
+
+    Returns:
+        int: Number of records deleted
+    """
+    cutoff = add_days(now_datetime(), -cint(days))
+    archive_path = None
+    deleted = 0
+
+    while True:
+        # Served by the (feed_setup, status, modified_date) index
+        names = frappe.db.sql_list(
+            f"""select name from `tab{RECORD_DOCTYPE}`
+            where feed_setup = %s and status = %s and modified_date < %s
+            order by modified_date
+            limit %s""",
+            (feed_setup, status, cutoff, chunk_size)
+        )
+        if not names:
+            break
+
+        if archive:
+            if not archive_path:
+                archive_path = get_archive_path(feed_setup, status)
+            append_to_archive(archive_path, names)
+
+        frappe.db.sql(f"delete from `tab{RECORD_DOCTYPE}` where name in %s", (tuple(names),))
+        update_record_counts({(feed_setup, status): -len(names)})
+        frappe.db.commit()
+        deleted += len(names)
+
+    if archive_path:
+        attach_archive(archive_path, feed_setup)
+        frappe.db.commit()
+
+    return deleted
+
+
+def purge_orphaned_payloads(chunk_size=PURGE_CHUNK_SIZE):
+    """
+    Delete Feed Payloads no Supplier Feed Record refers to anymore
+
+    A running fetch writes or reuses a payload before the records that refer
+    to it are committed. PayloadStore sets the modified timestamp of every
+    payload it writes or reuses, so payloads modified within the grace
+    period are skipped, and the delete checks both conditions again.
+
+    Payloads are walked once in name order, each chunk of candidates
+    deleted with a single statement that keeps the ones still referred to.
+    """
+    cutoff = add_days(now_datetime(), -PAYLOAD_GRACE_DAYS)
+    last = ""
+
+    while True:
+        names = frappe.db.sql_list(
+            f"""select name from `tab{PAYLOAD_DOCTYPE}`
+            where name > %s and modified < %s
+            order by name
+            limit %s""",
+            (last, cutoff, chunk_size)
+        )
+        if not names:
+            break
+        frappe.db.sql(
+            f"""delete payload from `tab{PAYLOAD_DOCTYPE}` payload
+            where payload.name in %s and payload.modified < %s and not exists (
+                select 1 from `tab{RECORD_DOCTYPE}` record
+                where record.raw_data_payload = payload.name
+            )""",
+            (tuple(names), cutoff)
+        )
+        frappe.db.commit()
+        last = names[-1]
+
+
+def get_archive_path(feed_setup, status):
+    """Return a new path for an archive in the site's private files"""
+    filename = f"{frappe.scrub(feed_setup)}-{frappe.scrub(status)}-{nowdate()}-{frappe.generate_hash(length=6)}.jsonl.gz"
+    return frappe.get_site_path("private", "files", filename)
+
+
+def append_to_archive(path, names):
+    """Append the full rows of the given records as one gzip member of JSON lines
+
+    Each chunk is a complete gzip member, so the archive can be read with
+    gzip or zcat even if a later chunk fails.
+    """
+    rows = frappe.db.sql(
+        f"select * from `tab{RECORD_DOCTYPE}` where name in %s",
+        (tuple(names),),
+        as_dict=True
+    )
+
+    # Archives are self-contained, so compressed payloads are inlined
+    payloads = get_payloads([row.raw_data_payload for row in rows if row.get("raw_data_payload")])
+    for row in rows:
+        if row.get("raw_data_payload") and not row.raw_data:
+            row.raw_data = payloads.get(row.raw_data_payload)
+
+    with gzip.open(path, "at", encoding="utf-8") as archive:
+        for row in rows:
+            archive.write(json.dumps(row, default=str, separators=(",", ":")))
+            archive.write("\n")
+
+
+def attach_archive(path, feed_setup):
+    """Register an archive as a private File attached to the Feed Setup"""
+    filename = os.path.basename(path)
+    frappe.get_doc({
+        "doctype": "File",
+        "file_name": filename,
+        "file_url": f"/private/files/{filename}",
+        "is_private": 1,
+        "attached_to_doctype": "Feed Setup",
+        "attached_to_name": feed_setup
+    }).insert(ignore_permissions=True)
\ No newline at end of file
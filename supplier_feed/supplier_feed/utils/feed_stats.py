@@ -0,0 +1,80 @@
+import frappe
+from frappe.utils import now
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+COUNT_DOCTYPE = "Feed Record Count"
+LOOKUP_CHUNK_SIZE = 1000
+
+
+def update_record_counts(deltas):
+    """
+    Add to the per feed, per status record counters
+
+    Each counter is changed with a single upsert, so concurrent fetches of
+    different feeds never wait on each other.
+
+    Args:
+        deltas (dict): Change in record count by (feed_setup, status)
+    """
+    timestamp = now()
+    user = frappe.session.user
+    for (feed_setup, status), delta in deltas.items():
+        if not delta or not feed_setup or not status:
+            continue
+        frappe.db.sql(
+            f"""insert into `tab{COUNT_DOCTYPE}`
+                (name, creation, modified, owner, modified_by, feed_setup, status, record_count)
+            values (%s, %s, %s, %s, %s, %s, %s, %s)
+            on duplicate key update
+                record_count = record_count + values(record_count),
+                modified = values(modified)""",
+            (frappe.generate_hash(length=10), timestamp, timestamp, user, user, feed_setup, status, delta)
+        )
+
+
+def change_record_status(names, status):
+    """
+    Move the given records to a new status in the counters
+
+    Call this before a set-based status update, which bypasses the
+    document hooks that keep the counters up to date.
+
+    Args:
+        names (list): Supplier Feed Record names
+        status (str): Status the records are about to get
+    """
+    deltas = {}
+    for i in range(0, len(names), LOOKUP_CHUNK_SIZE):
+        for row in frappe.db.sql(
+            f"""select feed_setup, status, count(*) as count
+            from `tab{RECORD_DOCTYPE}`
+            where name in %s and status != %s
+            group by feed_setup, status""",
+            (tuple(names[i:i + LOOKUP_CHUNK_SIZE]), status),
+            as_dict=True
+        ):
+            deltas[(row.feed_setup, row.status)] = deltas.get((row.feed_setup, row.status), 0) - row.count
+            deltas[(row.feed_setup, status)] = deltas.get((row.feed_setup, status), 0) + row.count
+    update_record_counts(deltas)
+
+
+def rebuild_record_counts():
+    """Recompute every counter from the Supplier Feed Record table"""
+    frappe.db.delete(COUNT_DOCTYPE)
+    update_record_counts({
+        (row.feed_setup, row.status): row.count
+        for row in frappe.db.sql(
+            f"""select feed_setup, status, count(*) as count
+            from `tab{RECORD_DOCTYPE}`
+            group by feed_setup, status""",
+            as_dict=True
+        )
+    })
+
+
+def get_record_counts():
+    """Return the counters as {feed_setup: {status: count}}"""
+    counts = {}
+    for row in frappe.get_all(COUNT_DOCTYPE, fields=["feed_setup", "status", "record_count"]):
+        counts.setdefault(row.feed_setup, {})[row.status] = row.record_count
+    return counts
\ No newline at end of file
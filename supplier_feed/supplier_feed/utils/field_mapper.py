@@ -0,0 +1,158 @@
+import frappe
+from frappe.model import default_fields
+from frappe.utils import cint, flt
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+
+# Fields that are set by the ingestion itself and cannot be mapped
+PROTECTED_FIELDS = ("feed_setup", "supplier", "raw_data", "raw_data_payload", "creation_date", "modified_date")
+
+_MISSING = object()
+
+
+class MappingPlan:
+    """Field mappings of a Feed Setup compiled once per fetch
+
+    Source fields may be nested paths such as "price/amount", which look up
+    the flat key first and then walk into nested dicts and lists. Each mapping
+    can trim, change case, cast and scale its value.
+    """
+
+    def __init__(self, mappings, valid_targets):
+        self.mappings = [
+            {
+                "source_field": (mapping.get("source_field") or "").strip(),
+                "target_field": (mapping.get("target_field") or "").strip(),
+                "transform": mapping.get("transform"),
+                "scale": flt(mapping.get("scale"))
+            }
+            for mapping in mappings
+        ]
+        self.valid_targets = frozenset(valid_targets)
+        self._compile()
+
+    @classmethod
+    def from_feed_setup(cls, feed_setup):
+        mappings = [mapping.as_dict() for mapping in feed_setup.field_mappings]
+        return cls(mappings, get_mappable_fields())
+
+    def __getstate__(self):
+        return {"mappings": self.mappings, "valid_targets": self.valid_targets}
+
+    def __setstate__(self, state):
+        self.mappings = state["mappings"]
+        self.valid_targets = state["valid_targets"]
+        self._compile()
+
+    def _compile(self):
+        self.invalid = []
+        self.targets = []
+        steps = []
+        simple = True
+
+        for mapping in self.mappings:
+            source_field, target_field = mapping["source_field"], mapping["target_field"]
+            if target_field not in self.valid_targets:
+                self.invalid.append(mapping)
+                continue
+
+            convert = _build_converter(mapping["transform"], mapping["scale"])
+            nested = "/" in source_field
+            if convert or nested:
+                simple = False
+
+            steps.append((source_field, target_field, _build_getter(source_field) if nested else None, convert))
+            if target_field not in self.targets:
+                self.targets.append(target_field)
+
+        self.simple = simple
+        self.pairs = tuple((source_field, target_field) for source_field, target_field, _, _ in steps)
+        self.steps = tuple(steps)
+
+    def validate(self):
+        """Throw if any mapping targets a field that cannot be set"""
+        if self.invalid:
+            fields = ", ".join(sorted({mapping["target_field"] or "(empty)" for mapping in self.invalid}))
+            frappe.throw(f"Field Mappings target fields that do not exist on {RECORD_DOCTYPE}: {fields}")
+
+    def map(self, item):
+        """Map a single feed item to Supplier Feed Record fields"""
+        if self.simple:
+            return {target: item[source] for source, target in self.pairs if source in item}
+
+        mapped_data = {}
+        for source_field, target_field, getter, convert in self.steps:
+            if getter:
+                value = getter(item)
+                if value is _MISSING:
+                    continue
+            elif source_field in item:
+                value = item[source_field]
+            else:
+                continue
+
+            mapped_data[target_field] = convert(value) if convert and value is not None else value
+
+        return mapped_data
+
+
+def get_mappable_fields():
+    """Return the Supplier Feed Record columns a mapping may target"""
+    meta = frappe.get_meta(RECORD_DOCTYPE)
+    return [
+        fieldname for fieldname in meta.get_valid_columns()
+        if fieldname not in default_fields and fieldname not in PROTECTED_FIELDS
+    ]
+
+
+def _build_getter(path):
+    """Return a function that reads a "/" separated path from an item"""
+    parts = tuple(part for part in path.split("/") if part)
+
+    def get_value(item):
+        if path in item:
+            return item[path]
+
+        value = item
+        for part in parts:
+            if isinstance(value, dict):
+                if part not in value:
+                    return _MISSING
+                value = value[part]
+            elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+                value = value[int(part)]
+            else:
+                return _MISSING
+        return value
+
+    return get_value
+
+
+def _build_converter(transform, scale):
+    """Return a function applying the transform and scale of a mapping, or None"""
+    functions = []
+    if transform == "Trim":
+        functions.append(lambda value: value.strip() if isinstance(value, str) else value)
+    elif transform == "Uppercase":
+        functions.append(lambda value: value.strip().upper() if isinstance(value, str) else value)
+    elif transform == "Lowercase":
+        functions.append(lambda value: value.strip().lower() if isinstance(value, str) else value)
+    elif transform == "Integer":
+        functions.append(cint)
+    elif transform == "Float":
+        functions.append(flt)
+
+    if scale and scale != 1:
+        functions.append(lambda value: flt(value) * scale)
+
+    if not functions:
+        return None
+    if len(functions) == 1:
+        return functions[0]
+
+    def convert(value):
+        for function in functions:
+            value = function(value)
+        return value
+
+    return convert
\ No newline at end of file
@@ -0,0 +1,112 @@
+import frappe
+from frappe.utils import cstr
+from supplier_feed.supplier_feed.utils.bulk_update import bulk_set_value
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+MATCH_KEYS = ("item_code", "barcode", "supplier_part_no")
+DEFAULT_MATCH_ORDER = "item_code,barcode,supplier_part_no"
+LOOKUP_CHUNK_SIZE = 1000
+
+
+def get_match_key_order(match_order=None):
+    """Parse a comma separated match order into a list of match keys"""
+    keys = [key.strip() for key in cstr(match_order or DEFAULT_MATCH_ORDER).split(",") if key.strip()]
+    invalid = [key for key in keys if key not in MATCH_KEYS]
+    if invalid:
+        frappe.throw(f"Invalid item match keys: {', '.join(invalid)}. Use {', '.join(MATCH_KEYS)}")
+    return keys
+
+
+def match_feed_records(feed_setup, record_names=None, overwrite=False):
+    """
+    Link Supplier Feed Records of a feed to Items in one set-based pass
+
+    The record item codes are looked up once per match key (Item code,
+    Item Barcode, and the supplier's part numbers in Item Supplier), and the
+    first key that finds an Item, in the feed's match order, wins.
+
+    Args:
+        feed_setup (Document): Feed Setup whose records should be matched
+        record_names (list, optional): Only match these records. Defaults to
+                                       all pending records of the feed.
+        overwrite (bool, optional): Also re-match records that already have
+                                    a mapped item. Defaults to False.
+
+    Returns:
+        dict: Match statistics, with a count per match key
+    """
+    key_order = get_match_key_order(feed_setup.item_match_order)
+
+    filters = {"feed_setup": feed_setup.name, "item_code": ["is", "set"]}
+    if record_names:
+        filters["name"] = ["in", record_names]
+    else:
+        filters["status"] = "Pending"
+    if not overwrite:
+        filters["mapped_item"] = ["is", "not set"]
+
+    records = frappe.get_all(RECORD_DOCTYPE, filters=filters, fields=["name", "item_code"])
+    codes = list({cstr(record.item_code).strip() for record in records})
+
+    loaders = {
+        "item_code": _load_item_codes,
+        "barcode": _load_barcodes,
+        "supplier_part_no": _load_supplier_part_numbers
+    }
+    indexes = {key: loaders[key](codes, feed_setup.supplier) for key in key_order}
+
+    stats = {"records": len(records), "matched": 0, "unmatched": 0}
+    stats.update({key: 0 for key in key_order})
+
+    matches = {}
+    for record in records:
+        lookup = cstr(record.item_code).strip().casefold()
+        for key in key_order:
+            item = indexes[key].get(lookup)
+            if item:
+                matches[record.name] = item
+                stats[key] += 1
+                break
+
+    bulk_set_value(RECORD_DOCTYPE, "mapped_item", matches)
+
+    stats["matched"] = len(matches)
+    stats["unmatched"] = len(records) - len(matches)
+    return stats
+
+
+def _chunks(values):
+    for i in range(0, len(values), LOOKUP_CHUNK_SIZE):
+        yield values[i:i + LOOKUP_CHUNK_SIZE]
+
+
+def _load_item_codes(codes, supplier):
+    index = {}
+    for chunk in _chunks(codes):
+        for name in frappe.get_all("Item", filters={"name": ["in", chunk], "disabled": 0}, pluck="name"):
+            index[name.casefold()] = name
+    return index
+
+
+def _load_barcodes(codes, supplier):
+    index = {}
+    for chunk in _chunks(codes):
+        for row in frappe.get_all(
+            "Item Barcode",
+            filters={"barcode": ["in", chunk]},
+            fields=["barcode", "parent"]
+        ):
+            index.setdefault(row.barcode.casefold(), row.parent)
+    return index
+
+
+def _load_supplier_part_numbers(codes, supplier):
+    index = {}
+    for chunk in _chunks(codes):
+        for row in frappe.get_all(
+            "Item Supplier",
+            filters={"supplier": supplier, "supplier_part_no": ["in", chunk]},
+            fields=["supplier_part_no", "parent"]
+        ):
+            index.setdefault(row.supplier_part_no.casefold(), row.parent)
+    return index
\ No newline at end of file
@@ -0,0 +1,308 @@
+import frappe
+import json
+from frappe.utils import now, flt
+from supplier_feed.supplier_feed.utils.bulk_update import bulk_set_value
+from supplier_feed.supplier_feed.utils.stock_sync import get_stock_warehouse, get_records_with_stock, post_stock_levels
+from supplier_feed.supplier_feed.utils.feed_stats import change_record_status
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+SYNC_CHUNK_SIZE = 500
+SYNC_JOB_TIMEOUT = 3600
+
+RECORD_SYNC_FIELDS = ["name", "feed_setup", "mapped_item", "item_name", "description", "price", "currency", "stock_qty"]
+
+
+@frappe.whitelist()
+def bulk_approve(names):
+    """Approve pending Supplier Feed Records with a single update"""
+    if isinstance(names, str):
+        names = json.loads(names)
+    frappe.has_permission(RECORD_DOCTYPE, "write", throw=True)
+
+    names = frappe.get_all(
+        RECORD_DOCTYPE,
+        filters={"name": ["in", names], "status": "Pending"},
+        pluck="name"
+    )
+    if names:
+        change_record_status(names, "Approved")
+        frappe.db.set_value(
+            RECORD_DOCTYPE,
+            {"name": ["in", names]},
+            {"status": "Approved", "modified_date": now()}
+        )
+    return len(names)
+
+
+@frappe.whitelist()
+def enqueue_bulk_sync(feed_setup=None, names=None):
+    """Queue a job that syncs approved records of a feed, or the given records, to Items"""
+    if isinstance(names, str):
+        names = json.loads(names)
+    frappe.has_permission(RECORD_DOCTYPE, "write", throw=True)
+
+    filters = {"status": "Approved", "mapped_item": ["is", "set"]}
+    if feed_setup:
+        filters["feed_setup"] = feed_setup
+    if names:
+        filters["name"] = ["in", names]
+
+    frappe.enqueue(
+        "supplier_feed.supplier_feed.utils.item_sync.sync_feed_records",
+        queue="long",
+        timeout=SYNC_JOB_TIMEOUT,
+        job_id=f"supplier_feed::sync::{feed_setup}" if feed_setup and not names else None,
+        deduplicate=bool(feed_setup and not names),
+        filters=filters
+    )
+    frappe.msgprint("Item sync has been queued")
+
+
+def sync_feed_records(filters, chunk_size=SYNC_CHUNK_SIZE):
+    """
+    Sync approved Supplier Feed Records to Items and Item Prices in chunks
+
+    The selling price list is read once. For each chunk, existing Item
+    Price rows are fetched in one query, then updated and inserted with
+    set-based statements. Each chunk is committed on its own and progress
+    is published to the user who queued the job. Stock levels are collected
+    across all chunks and posted at the end as Stock Reconciliations, one
+    set per warehouse.
+
+    Args:
+        filters (dict): Filters selecting the records to sync
+        chunk_size (int, optional): Records per chunk. Defaults to 500.
+
+    Returns:
+        dict: Sync statistics
+    """
+    names = frappe.get_all(RECORD_DOCTYPE, filters=filters, pluck="name", order_by="creation asc")
+    syncer = ItemSyncer()
+
+    for i in range(0, len(names), chunk_size):
+        records = frappe.get_all(
+            RECORD_DOCTYPE,
+            filters={"name": ["in", names[i:i + chunk_size]]},
+            fields=RECORD_SYNC_FIELDS
+        )
+        syncer.sync(records)
+        frappe.db.commit()
+
+        done = min(i + chunk_size, len(names))
+        frappe.publish_progress(
+            done * 100 / len(names),
+            title="Syncing feed records",
+            description=f"{done} of {len(names)} records"
+        )
+
+    syncer.post_stock()
+    frappe.db.commit()
+
+    stats = syncer.stats
+    frappe.publish_realtime(
+        "msgprint",
+        f"Synced {stats['synced']} records ({stats['failed']} failed). "
+        f"Items saved: {stats['item_saves']}, saves avoided: {stats['item_saves_skipped']}. "
+        f"Prices updated: {stats['prices_updated']}, created: {stats['prices_created']}. "
+        f"Stock levels posted: {stats['stock_posted']}, unchanged: {stats['stock_unchanged']}.",
+        user=frappe.session.user
+    )
+    return stats
+
+
+def get_item_changes(record, current):
+    """
+    Return the Item fields a feed record would change
+
+    Args:
+        record (dict): Supplier Feed Record values
+        current (dict): Current item_name and description of the Item
+
+    Returns:
+        dict: Changed values by fieldname, empty if the Item is up to date
+    """
+    changes = {}
+    if record.item_name and record.item_name != current.item_name:
+        changes["item_name"] = record.item_name
+    if record.description and record.description != current.description:
+        changes["description"] = record.description
+    return changes
+
+
+class ItemSyncer:
+    """Apply Supplier Feed Records to Items and Item Prices, a chunk at a time"""
+
+    def __init__(self):
+        self.price_list = frappe.db.get_single_value("Selling Settings", "selling_price_list")
+        self.price_list_flags = {}
+        if self.price_list:
+            self.price_list_flags = frappe.db.get_value(
+                "Price List", self.price_list, ["buying", "selling"], as_dict=True
+            ) or {}
+        self.stats = {
+            "synced": 0, "failed": 0, "item_saves": 0, "item_saves_skipped": 0,
+            "prices_updated": 0, "prices_created": 0,
+            "stock_posted": 0, "stock_unchanged": 0, "stock_reconciliations": []
+        }
+        self.stock_warehouses = {}
+        self.stock_levels = {}
+
+    def sync(self, records):
+        current_items = {
+            item.name: item
+            for item in frappe.get_all(
+                "Item",
+                filters={"name": ["in", list({record.mapped_item for record in records})]},
+                fields=["name", "item_name", "description"]
+            )
+        } if records else {}
+
+        synced = []
+        for record in records:
+            try:
+                current = current_items.get(record.mapped_item)
+                if not current:
+                    raise frappe.DoesNotExistError(f"Item {record.mapped_item} not found")
+                self.update_item(record, current)
+                synced.append(record)
+            except Exception as e:
+                self.stats["failed"] += 1
+                frappe.log_error(f"Error syncing record {record.name} to item: {str(e)}", "Feed Sync Error")
+
+        self.update_prices(synced)
+        self.collect_stock(synced)
+
+        if synced:
+            change_record_status([record.name for record in synced], "Synced")
+            frappe.db.set_value(
+                RECORD_DOCTYPE,
+                {"name": ["in", [record.name for record in synced]]},
+                {"status": "Synced", "modified_date": now()}
+            )
+        self.stats["synced"] += len(synced)
+
+    def update_item(self, record, current):
+        """Copy item name and description to the Item, saving it only if they changed"""
+        changes = get_item_changes(record, current)
+        if not changes:
+            self.stats["item_saves_skipped"] += 1
+            return
+
+        item = frappe.get_doc("Item", record.mapped_item)
+        item.update(changes)
+        item.save()
+        self.stats["item_saves"] += 1
+        # Later records for the same Item compare against the saved values
+        current.update(changes)
+
+    def collect_stock(self, records):
+        """Remember the stock quantity of each record until post_stock is called
+
+        Records whose feed item had no stock quantity are left out, so a
+        missing value never sets the stock to zero.
+        """
+        by_feed = {}
+        for record in records:
+            if record.feed_setup not in self.stock_warehouses:
+                self.stock_warehouses[record.feed_setup] = get_stock_warehouse(record.feed_setup)
+            if self.stock_warehouses[record.feed_setup]:
+                by_feed.setdefault(record.feed_setup, []).append(record)
+
+        for feed_setup, feed_records in by_feed.items():
+            warehouse = self.stock_warehouses[feed_setup]
+            with_stock = get_records_with_stock(feed_setup, [record.name for record in feed_records])
+            for record in feed_records:
+                if record.name in with_stock:
+                    self.stock_levels.setdefault(warehouse, {})[record.mapped_item] = flt(record.stock_qty)
+
+    def post_stock(self):
+        """Post the collected stock levels, one batch of Stock Reconciliations per warehouse
+
+        Each warehouse is committed on its own, so a failure in one does not
+        undo the others and only committed documents are counted.
+        """
+        for warehouse, levels in self.stock_levels.items():
+            try:
+                result = post_stock_levels(warehouse, levels)
+                frappe.db.commit()
+            except Exception as e:
+                frappe.db.rollback()
+                frappe.log_error(f"Error posting stock levels to {warehouse}: {str(e)}", "Feed Sync Error")
+                continue
+            self.stats["stock_posted"] += result["posted"]
+            self.stats["stock_unchanged"] += result["unchanged"]
+            self.stats["stock_reconciliations"] += result["documents"]
+        self.stock_levels = {}
+
+    def update_prices(self, records):
+        """Update or create the selling Item Price of every record in one pass"""
+        if not self.price_list:
+            return
+
+        prices = {}
+        for record in records:
+            if record.price and record.currency:
+                prices[(record.mapped_item, record.currency)] = flt(record.price)
+        if not prices:
+            return
+
+        existing = {}
+        for row in frappe.get_all(
+            "Item Price",
+            filters={
+                "price_list": self.price_list,
+                "item_code": ["in", list({item_code for item_code, currency in prices})]
+            },
+            fields=["name", "item_code", "currency", "price_list_rate"]
+        ):
+            existing.setdefault((row.item_code, row.currency), row)
+
+        updates = {}
+        inserts = []
+        for key, rate in prices.items():
+            row = existing.get(key)
+            if not row:
+                inserts.append((key, rate))
+            elif flt(row.price_list_rate) != rate:
+                updates[row.name] = rate
+
+        bulk_set_value("Item Price", "price_list_rate", updates)
+        self.insert_prices(inserts)
+
+        self.stats["prices_updated"] += len(updates)
+        self.stats["prices_created"] += len(inserts)
+
+    def insert_prices(self, prices):
+        if not prices:
+            return
+
+        items = {
+            item.name: item
+            for item in frappe.get_all(
+                "Item",
+                filters={"name": ["in", list({item_code for (item_code, currency), rate in prices})]},
+                fields=["name", "item_name", "description", "brand", "stock_uom"]
+            )
+        }
+
+        timestamp = now()
+        user = frappe.session.user
+        values = []
+        for (item_code, currency), rate in prices:
+            item = items.get(item_code) or frappe._dict()
+            values.append([
+                frappe.generate_hash(length=10), timestamp, timestamp, user, user, 0,
+                item_code, item.item_name, item.description, item.brand, item.stock_uom,
+                self.price_list, self.price_list_flags.get("buying") or 0,
+                self.price_list_flags.get("selling") or 0, currency, rate
+            ])
+
+        frappe.db.bulk_insert(
+            "Item Price",
+            [
+                "name", "creation", "modified", "owner", "modified_by", "docstatus",
+                "item_code", "item_name", "item_description", "brand", "uom",
+                "price_list", "buying", "selling", "currency", "price_list_rate"
+            ],
+            values
+        )
\ No newline at end of file
@@ -0,0 +1,242 @@
+import codecs
+import io
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from supplier_feed.supplier_feed.utils.feed_parser import CSV_SNIFF_SIZE, _iter_csv_rows
+
+# Files smaller than this are parsed in the calling process
+PARALLEL_CSV_MIN_SIZE = 16 * 1024 * 1024
+# Target size of the byte range handed to one worker task
+CSV_RANGE_SIZE = 4 * 1024 * 1024
+SCAN_BLOCK_SIZE = 1024 * 1024
+# Row appended to every range; it is only parsed as a row of its own when
+# the range does not end inside a quoted field
+RANGE_END_MARKER = "\x1esupplier_feed:range_end\x1e"
+
+
+def parse_csv_parallel(path, plan, workers, encoding=None, quotechar='"', range_size=CSV_RANGE_SIZE):
+    """
+    Parse and map a CSV file in a pool of worker processes
+
+    The file is split into byte ranges that end on a newline preceded by
+    an even number of quote characters. That is a record boundary unless
+    a stray quote, such as the inch mark in 12" screen, sits in an unquoted
+    field, so every worker checks that its range did not end inside a
+    quoted field. From the first range that did, the rest of the file is
+    parsed sequentially in the calling process, so the output is always
+    the same as iter_csv. Each worker parses its range with the header row
+    prepended and maps the rows with the picklable MappingPlan. Results are
+    yielded in file order, with at most two ranges per worker in flight so
+    memory stays bounded when ingestion is slower than parsing.
+
+    The caller still unpickles every row, so the gain is bounded by that;
+    the main win is that parsing and mapping overlap with database writes
+    in the calling process.
+
+    Args:
+        path (str): Path of the decompressed CSV file
+        plan (MappingPlan): Field mappings to apply in the workers
+        workers (int): Number of worker processes
+        encoding (str, optional): Declared encoding. Defaults to UTF-8.
+        quotechar (str, optional): CSV quote character. Defaults to '"'.
+        range_size (int, optional): Target bytes per task. Defaults to 4 MB.
+
+    Returns:
+        iterator: (item, mapped_data) pairs in file order, or None if the
+                  file cannot be split (an encoding where quotes and
+                  newlines are not single bytes, or no header row in the
+                  first 64 KB); parse it sequentially instead.
+    """
+    encoding = encoding or "utf-8-sig"
+    if not _is_byte_splittable(encoding):
+        return None
+
+    quote = quotechar.encode("ascii")
+    header = _find_header(path, quote)
+    if not header:
+        return None
+
+    header_start, header_end = header
+    size = os.path.getsize(path)
+    # Several ranges per worker, so rows reach the caller while later ranges are parsed
+    parts = max(int(workers) * 4, (size - header_end) // range_size)
+    ranges = find_csv_ranges(path, parts, start=header_end, quotechar=quote)
+
+    with open(path, "rb") as f:
+        f.seek(header_start)
+        header_bytes = f.read(header_end - header_start)
+
+    return _iter_results(path, header_bytes, ranges, plan, int(workers), encoding, quotechar)
+
+
+def find_csv_ranges(path, parts, start=0, quotechar=b'"'):
+    """
+    Split a CSV file into about parts byte ranges that start on a record
+
+    The file is read once in blocks. The quote parity at a newline tells
+    whether it ends a record (even) or sits inside a quoted field (odd);
+    escaped quotes are doubled and leave the parity unchanged.
+
+    Args:
+        path (str): Path of the CSV file
+        parts (int): Number of ranges wanted
+        start (int, optional): Offset of the first data record. Defaults to 0.
+        quotechar (bytes, optional): Quote character. Defaults to b'"'.
+
+    Returns:
+        list: (start, end) byte offsets, covering the file from start
+    """
+    size = os.path.getsize(path)
+    targets = iter(start + (size - start) * i // parts for i in range(1, max(int(parts), 1)))
+    target = next(targets, None)
+    starts = [start]
+
+    with open(path, "rb") as f:
+        f.seek(start)
+        offset = start
+        quotes = 0
+        while target is not None:
+            block = f.read(SCAN_BLOCK_SIZE)
+            if not block:
+                break
+
+            pos = max(target - offset, 0)
+            while target is not None:
+                newline = block.find(b"\n", pos)
+                if newline < 0:
+                    break
+                if (quotes + block.count(quotechar, 0, newline)) % 2:
+                    # Inside a quoted field, try the next newline
+                    pos = newline + 1
+                    continue
+
+                boundary = offset + newline + 1
+                if boundary < size and boundary > starts[-1]:
+                    starts.append(boundary)
+                while target is not None and target < boundary:
+                    target = next(targets, None)
+                if target is not None:
+                    pos = max(target - offset, newline + 1)
+
+            quotes += block.count(quotechar)
+            offset += len(block)
+
+    return list(zip(starts, starts[1:] + [size]))
+
+
+def _is_byte_splittable(encoding):
+    """True if newlines and quotes are single ASCII bytes in the encoding"""
+    try:
+        name = codecs.lookup(encoding).name
+    except LookupError:
+        return False
+    if name.startswith(("utf-16", "utf-32")):
+        return False
+    return "\n\"".encode(name).endswith(b"\n\"")
+
+
+def _find_header(path, quotechar):
+    """Return the byte range of the header row, skipping leading blank lines"""
+    with open(path, "rb") as f:
+        prefix = f.read(CSV_SNIFF_SIZE)
+
+    line_start = pos = 0
+    while True:
+        newline = prefix.find(b"\n", pos)
+        if newline < 0:
+            return None
+        if prefix.count(quotechar, 0, newline) % 2:
+            pos = newline + 1
+            continue
+        if prefix[line_start:newline + 1].strip(b"\r\n\t \xef\xbb\xbf"):
+            return line_start, newline + 1
+        line_start = pos = newline + 1
+
+
+def _iter_results(path, header_bytes, ranges, plan, workers, encoding, quotechar):
+    # Workers are spawned rather than forked, so they never share the
+    # parent's database connection or locks
+    context = multiprocessing.get_context("spawn")
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+    pending = deque()
+    ranges = iter(ranges)
+    try:
+        for start, end in ranges:
+            pending.append((start, executor.submit(_parse_range, path, header_bytes, start, end, plan, encoding, quotechar)))
+            if len(pending) >= workers * 2:
+                break
+
+        while pending:
+            start, future = pending.popleft()
+            rows = future.result()
+            if rows is None:
+                # The range was cut inside a quoted field, so were the ones after it
+                for _, later in pending:
+                    later.cancel()
+                pending.clear()
+                yield from _parse_rest(path, header_bytes, start, plan, encoding, quotechar)
+                return
+
+            next_range = next(ranges, None)
+            if next_range:
+                pending.append((
+                    next_range[0],
+                    executor.submit(_parse_range, path, header_bytes, *next_range, plan, encoding, quotechar)
+                ))
+            yield from rows
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _parse_range(path, header_bytes, start, end, plan, encoding, quotechar):
+    """
+    Worker task: parse and map the records in one byte range
+
+    Returns:
+        list: (item, mapped_data) pairs, or None if the range ends inside a
+              quoted field
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(end - start)
+
+    text = (header_bytes + data).decode(encoding, errors="replace")
+    stream = io.StringIO(f"{text}\n{RANGE_END_MARKER}\n", newline="")
+    items = list(_iter_csv_rows(stream, quotechar=quotechar))
+    # Inside an open quoted field the marker becomes part of the last value
+    if not items or RANGE_END_MARKER not in items[-1].values():
+        return None
+    items.pop()
+    return [(item, plan.map(item)) for item in items]
+
+
+def _parse_rest(path, header_bytes, start, plan, encoding, quotechar):
+    """Parse and map the file from a record boundary to the end in this process"""
+    with open(path, "rb") as f:
+        f.seek(start)
+        text = io.TextIOWrapper(f, encoding=encoding, errors="replace", newline="")
+        stream = _HeaderStream(header_bytes.decode(encoding, errors="replace"), text)
+        for item in _iter_csv_rows(stream, quotechar=quotechar):
+            yield item, plan.map(item)
+
+
+class _HeaderStream:
+    """A text stream that reads a header line before the lines of another stream"""
+
+    def __init__(self, header, stream):
+        self.header = header
+        self.stream = stream
+
+    def readline(self, size=-1):
+        if self.header is None:
+            return self.stream.readline(size)
+        line, self.header = self.header, None
+        return line
+
+    def __iter__(self):
+        if self.header is not None:
+            yield self.readline()
+        yield from self.stream
\ No newline at end of file
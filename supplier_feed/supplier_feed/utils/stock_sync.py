@@ -0,0 +1,156 @@
+import frappe
+import json
+from frappe.utils import flt
+from supplier_feed.supplier_feed.utils.field_mapper import MappingPlan
+from supplier_feed.supplier_feed.utils.feed_payloads import get_payloads
+
+RECORD_DOCTYPE = "Supplier Feed Record"
+STOCK_RECONCILIATION_CHUNK_SIZE = 500
+
+
+def get_stock_warehouse(feed_setup):
+    """
+    Return the warehouse supplier stock levels of a feed are posted to
+
+    Stock is only synced when the feed has a Stock Warehouse and maps a
+    source field to stock_qty, so an unmapped quantity is never taken to
+    mean zero stock.
+
+    Args:
+        feed_setup (str): Feed Setup name
+
+    Returns:
+        str: Warehouse name, or None if stock is not synced for the feed
+    """
+    warehouse = frappe.db.get_value("Feed Setup", feed_setup, "stock_warehouse")
+    if not warehouse:
+        return None
+
+    maps_stock = frappe.db.exists(
+        "Feed Field Mapping",
+        {"parent": feed_setup, "parenttype": "Feed Setup", "target_field": "stock_qty"}
+    )
+    return warehouse if maps_stock else None
+
+
+def get_records_with_stock(feed_setup, names):
+    """
+    Return the records whose feed item actually had a stock quantity
+
+    stock_qty is stored as 0 when an item lacks the mapped source field, so
+    the raw item is checked with the feed's stock_qty mappings instead. An
+    item without a quantity must not set the stock to zero.
+
+    Args:
+        feed_setup (str): Feed Setup name
+        names (list): Supplier Feed Record names of that feed
+
+    Returns:
+        set: Names of the records with a stock quantity in their item
+    """
+    mappings = frappe.get_all(
+        "Feed Field Mapping",
+        filters={"parent": feed_setup, "parenttype": "Feed Setup", "target_field": "stock_qty"},
+        fields=["source_field", "target_field", "transform", "scale"]
+    )
+    if not mappings or not names:
+        return set()
+
+    plan = MappingPlan(mappings, ["stock_qty"])
+    rows = frappe.get_all(
+        RECORD_DOCTYPE,
+        filters={"name": ["in", list(names)]},
+        fields=["name", "raw_data", "raw_data_payload"]
+    )
+    payloads = get_payloads([row.raw_data_payload for row in rows if not row.raw_data])
+
+    with_stock = set()
+    for row in rows:
+        try:
+            item = json.loads(row.raw_data or payloads.get(row.raw_data_payload) or "null")
+        except ValueError:
+            continue
+        if isinstance(item, dict) and plan.map(item).get("stock_qty") not in (None, ""):
+            with_stock.add(row.name)
+    return with_stock
+
+
+def post_stock_levels(warehouse, levels, chunk_size=STOCK_RECONCILIATION_CHUNK_SIZE):
+    """
+    Set stock levels in a warehouse with as few Stock Reconciliations as possible
+
+    Current quantities are read from Bin in one query and items whose
+    quantity already matches are skipped. Items that are not plain stock
+    items (non-stock, serialised or batched) are skipped as well.
+
+    Args:
+        warehouse (str): Warehouse to reconcile
+        levels (dict): Target quantity by item code
+        chunk_size (int, optional): Items per Stock Reconciliation. Defaults to 500.
+
+    Returns:
+        dict: Counts of posted, unchanged and skipped items, and the
+              names of the submitted Stock Reconciliations
+    """
+    stats = {"posted": 0, "unchanged": 0, "skipped": 0, "documents": []}
+    if not levels:
+        return stats
+
+    item_codes = list(levels)
+    items = {
+        item.name: item
+        for item in frappe.get_all(
+            "Item",
+            filters={
+                "name": ["in", item_codes],
+                "is_stock_item": 1,
+                "has_serial_no": 0,
+                "has_batch_no": 0,
+                "disabled": 0
+            },
+            fields=["name", "valuation_rate"]
+        )
+    }
+    bins = {
+        row.item_code: row
+        for row in frappe.get_all(
+            "Bin",
+            filters={"warehouse": warehouse, "item_code": ["in", item_codes]},
+            fields=["item_code", "actual_qty", "valuation_rate"]
+        )
+    }
+
+    rows = []
+    for item_code, qty in levels.items():
+        item = items.get(item_code)
+        if not item:
+            stats["skipped"] += 1
+            continue
+
+        qty = flt(qty)
+        current = bins.get(item_code)
+        if flt(current.actual_qty if current else 0) == qty:
+            stats["unchanged"] += 1
+            continue
+
+        valuation_rate = flt(current.valuation_rate if current else 0) or flt(item.valuation_rate)
+        rows.append({
+            "item_code": item_code,
+            "warehouse": warehouse,
+            "qty": qty,
+            "valuation_rate": valuation_rate,
+            "allow_zero_valuation_rate": 0 if valuation_rate else 1
+        })
+
+    company = frappe.db.get_value("Warehouse", warehouse, "company")
+    for i in range(0, len(rows), chunk_size):
+        reconciliation = frappe.new_doc("Stock Reconciliation")
+        reconciliation.company = company
+        reconciliation.purpose = "Stock Reconciliation"
+        reconciliation.set("items", rows[i:i + chunk_size])
+        reconciliation.insert(ignore_permissions=True)
+        reconciliation.submit()
+        stats["documents"].append(reconciliation.name)
+
+    stats["posted"] = len(rows)
+    return stats
\ No newline at end of file